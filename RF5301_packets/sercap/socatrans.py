@@ -14,10 +14,13 @@ NOTE: tee *is* required to save the log
 
 import sys
 
+# byte value -> 7-bit ASCII character, parity bit eaten
+_HEX2ASC = [chr(i%128) for i in range(256)]
+
 def hex2asc(hex):
     "Convert hex to 7-bit ASCII and eat the parity bit."
-    ch = chr(int('0x'+hex, 16)%128)
-    if ch is ' ':
+    ch = _HEX2ASC[int(hex, 16)]
+    if ch == ' ':
         return '\\x'+hex
     else:
         return ch
@@ -33,11 +36,12 @@ while True:
     if line[0] in iodict.keys():
         leader = str(ln)+'\t'+iodict[line[0]]+'\t'
     else:
-        hexvec = line.split(' ')
+        # split() drops the empty tokens and the newline
+        hexvec = line.split()
         if hexout:
             print(leader, end='')
-            print([hex.strip() for hex in hexvec if hex is not ''])
+            print(hexvec)
         if ascout:
             print(leader, end='')
-            print([let for let in [hex2asc(ch.strip()) if ch is not '' else ' ' for ch in hexvec] if let != ' '])
+            print(list(map(hex2asc, hexvec)))
         ln+=1
\ No newline at end of file
@@ -3,7 +3,7 @@
 import sys
 import serial
 import threading
-from re import sub
+import re
 
 """
 auxmcu.py
@@ -27,12 +27,21 @@ import serial
 import time
 import io
 
+# first (signed) decimal number in a reply
+_NUM_RE = re.compile(rb"[-+]?\d*\.?\d+")
+
 def str2float(bytestring):
-    if bytestring: return float(sub("[^0123456789\.]", "", bytestring.decode()))
+    "Pull the number out of a reply; None if there isn't one."
+    m = _NUM_RE.search(bytestring)
+    return float(m.group()) if m else None
     
 def str2bool(bytestring):
-    "Convert b'0'/b'1' to Boolean. b'' also returns False."
-    return bool(int('0'+bytestring.decode().strip()))
+    "Convert b'0'/b'1' to Boolean. b'' also returns False; anything else raises ValueError."
+    # leading zeros are padding; only an explicit 1 counts as True
+    digit = bytestring.strip().lstrip(b'0')
+    if digit not in (b'', b'1'):
+        raise ValueError("expected 0 or 1, got {!r}".format(bytestring))
+    return digit == b'1'
 
 class AuxMCU:
     def __init__(self, port, pos_em=None, pos_ex=None, baud=9600, timeout=3):
@@ -48,69 +57,60 @@ class AuxMCU:
         
     def disconnect(self):
         "Close serial interface."
-        self.__ser__.reset_input_buffer()
-        self.__ser__.reset_output_buffer()
-        self.__ser__.close()
+        with self.lock:
+            self.__ser__.reset_input_buffer()
+            self.__ser__.reset_output_buffer()
+            self.__ser__.close()
+        
+    def txrx(self, cmd, nbytes):
+        "Send command (bytes), return its fixed-length reply with line ending stripped"
+        with self.lock:
+            # flush input, so a stale reply can't be mistaken for this one
+            self.__ser__.reset_input_buffer()
+            self.__ser__.write(cmd)
+            # returns as soon as nbytes are in, or on timeout
+            return self.__ser__.read(nbytes).rstrip()
         
     # setter/getters
     
     def ex(self, filt=None):
         "Command or query the excitation filter wheel"
         if filt is not None:
-            # flush I/O
-            self.__ser__.flush()
-            self.__ser__.write("X{}\n".format(filt).encode())
-            self.pos_ex = self.__ser__.read(4).rstrip().decode()[1]
+            with self.lock:
+                self.pos_ex = self.txrx("X{}\n".format(filt).encode(), 4).decode()[1]
         return self.pos_ex
         
     def em(self, filt=None):
         "Command or query the emission filter wheel"
         if filt is not None:
-            # flush I/O
-            self.__ser__.flush()
-            self.__ser__.write("M{}\n".format(filt).encode())
-            self.pos_em = self.__ser__.read(4).rstrip().decode()[1]
+            with self.lock:
+                self.pos_em = self.txrx("M{}\n".format(filt).encode(), 4).decode()[1]
         return self.pos_em
         
     def lamp(self, status=None):
         "Command or query the spec lamp interlock"
-        # flush I/O
-        self.__ser__.flush()
         if status is not None:
-            if status: 
-                self.__ser__.write("LON\n".encode())
-                self.lamp_status = str2bool(self.__ser__.read(3).rstrip())
-            else: 
-                self.__ser__.write("LOF\n".encode())
-                self.lamp_status = str2bool(self.__ser__.read(3).rstrip())
-                # hack
-                #self.lamp_status = False
+            with self.lock:
+                if status: 
+                    self.lamp_status = str2bool(self.txrx(b"LON\n", 3))
+                else: 
+                    self.lamp_status = str2bool(self.txrx(b"LOF\n", 3))
+                    # hack
+                    #self.lamp_status = False
         return self.lamp_status
         
     def temp_get(self):
         "Request ambient temp in sample chamber"
-        # flush input
-        self.__ser__.write("TEM\n".encode())
-        self.__ser__.flush()
-        return str2float(self.__ser__.read(7).rstrip())
+        return str2float(self.txrx(b"TEM\n", 7))
         
     def hum_get(self):
         "Request relative humidity in sample chamber"
-        # flush input
-        self.__ser__.write("HUM\n".encode())
-        self.__ser__.flush()
-        return str2float(self.__ser__.read(7).rstrip())
+        return str2float(self.txrx(b"HUM\n", 7))
         
     def inf_get(self):
         "Request non-contact object temperature"
-        # flush input
-        self.__ser__.write("INF\n".encode())
-        self.__ser__.flush()
-        return str2float(self.__ser__.read(7).rstrip())
+        return str2float(self.txrx(b"INF\n", 7))
         
     def amb_get(self):
         "Request ambient temp as measured by IR device"
-        # flush input
-        self.__ser__.write("AMB\n".encode())
-        self.__ser__.flush()
-        return str2float(self.__ser__.read(7).rstrip())
\ No newline at end of file
+        return str2float(self.txrx(b"AMB\n", 7))
\ No newline at end of file
@@ -43,6 +43,9 @@ class AuxMCU:
         self.lock = threading.RLock()
         self.filt_ex = filt_ex
         self.filt_em = filt_em
+        # filter name -> wheel position
+        self.__idx_ex__ = {filt: i for i, filt in enumerate(filt_ex or [])}
+        self.__idx_em__ = {filt: i for i, filt in enumerate(filt_em or [])}
         
         self.lamp(False)
         # wheels_init() can be called later if desired for interface reasons
@@ -88,7 +91,7 @@ class AuxMCU:
         if filt is not None:
             # flush I/O
             self.__ser__.flush()
-            self.__ser__.write("EX{}\n".format(self.filt_ex.index(filt)).encode())
+            self.__ser__.write("EX{}\n".format(self.__idx_ex__[filt]).encode())
             self.pos_ex = int(self.__ser__.read(3).rstrip().decode())
         return self.filt_ex[self.pos_ex]
         
@@ -97,7 +100,7 @@ class AuxMCU:
         if filt is not None:
             # flush I/O
             self.__ser__.flush()
-            self.__ser__.write("EM{}\n".format(self.filt_em.index(filt)).encode())
+            self.__ser__.write("EM{}\n".format(self.__idx_em__[filt]).encode())
             self.pos_em = int(self.__ser__.read(3).rstrip().decode())
         return self.filt_em[self.pos_em]
         
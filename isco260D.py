@@ -20,8 +20,11 @@ GNU General Public License for more details.
 
 import serial
 import threading
+import logging
 from time import sleep
 
+logger = logging.getLogger(__name__)
+
 def dasnet_checksum(cmd):
     "Calculate 2-digit hex checksum for a DASNET command."
     #print([ord(char) for char in list(cmd)])
@@ -41,7 +44,7 @@ def dasnet2str(frame):
     frame = frame.decode().rstrip()
     ack = frame[0]
     dest = frame[1]
-    len_msg = eval("0x{}".format(frame[2:4]))
+    len_msg = int(frame[2:4], 16)
     msg = frame[4:-2]
     checksum = frame[-2:]
     # check message integrity
@@ -163,9 +166,11 @@ class ISCOController:
         }
         if mode in (list(shortcuts.values()) + list(shortcuts.keys())):
             self.__ser__.write(str2dasnet("INDEPENDENT".format(pump, mode)))
-            print(self.__ser__.read_until(b'\r'))
+            reply = self.__ser__.read_until(b'\r')
+            if logger.isEnabledFor(logging.DEBUG): logger.debug("INDEPENDENT -> %r", reply)
             self.__ser__.write(str2dasnet("INDEPENDENTCD".format(pump, mode)))
-            print(self.__ser__.read_until(b'\r'))
+            reply = self.__ser__.read_until(b'\r')
+            if logger.isEnabledFor(logging.DEBUG): logger.debug("INDEPENDENTCD -> %r", reply)
             try:
                 mode = shortcuts[mode]
             except KeyError:
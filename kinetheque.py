@@ -284,10 +284,10 @@ def main(args, stdin, stdout, stderr):
                     spec_free.clear()
                     if (state_curr['wl_ex'] == 340) and (state_curr['wl_em'] == 440):
                         print("setting wavelengths to Laurdan blue", file=stderr, end=' ')
-                        if spec.wl_set_laurdan_blu(): print('√', file=stderr)
+                        if spec.wl_set(340, 440): print('√', file=stderr)
                     elif (state_curr['wl_ex'] == 340) and (state_curr['wl_em'] == 490):
                         print("setting wavelengths to Laurdan red", file=stderr, end=' ')
-                        if spec.wl_set_laurdan_red(): print('√', file=stderr)
+                        if spec.wl_set(340, 490): print('√', file=stderr)
                     spec_free.set()
                 
                 # init a log table for the state
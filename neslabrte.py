@@ -26,6 +26,52 @@ import struct
 from re import sub
 from itertools import chain
 
+# identifiers for the status bits, per Table 2 in manual
+_STATI = (
+    "rtd1_open_fault",
+    "rtd1_short_fault",
+    "rtd1_open",
+    "rtd1_short",
+    "rtd3_open_fault",
+    "rtd3_short_fault",
+    "rtd3_open",
+    "rtd3_short",
+    "rtd2_open_fault",
+    "rtd2_short_fault",
+    "rtd2_open_warn",
+    "rtd2_short_warn",
+    "rtd2_open",
+    "rtd2_short",
+    "refrig_hi_temp",
+    "htc_fault",
+    "hi_fixed_temp_fault",
+    "lo_fixed_temp_fault",
+    "hi_temp_fault",
+    "lo_temp_fault",
+    "lo_level_fault",
+    "hi_temp_warn",
+    "lo_temp_warn",
+    "lo_level_warn",
+    "buzzer_on",
+    "alarm_muted",
+    "unit_faulted",
+    "unit_stopping",
+    "unit_on",
+    "pump_on",
+    "comp_on",
+    "heat_on",
+    "rtd2_controlling",
+    "heat_led_flashing",
+    "heat_led_on",
+    "cool_led_flashing",
+    "cool_led_on"
+)
+
+# frame constants
+_LEAD_RS232 = 0xca
+_LEAD_RS485 = 0xcc
+_ADDR_RS232 = b'\x00\x01'
+
 ## binary encode/decode functions
     
 def bytestr2bytelist(bytestr):
@@ -52,47 +98,7 @@ def threebyte2float(bytelist):
 def decode_status_array(fivebytes):
     "Decode RTE-7 controller's 5-byte status array to Python dict"
     fortybits = [bool(int(bit)) for bit in ''.join(bin(byte).split('b')[1] for byte in fivebytes).zfill(40)]
-    # identifiers for the bits, per Table 2 in manual
-    stati = [
-        "rtd1_open_fault",
-        "rtd1_short_fault",
-        "rtd1_open",
-        "rtd1_short",
-        "rtd3_open_fault",
-        "rtd3_short_fault",
-        "rtd3_open",
-        "rtd3_short",
-        "rtd2_open_fault",
-        "rtd2_short_fault",
-        "rtd2_open_warn",
-        "rtd2_short_warn",
-        "rtd2_open",
-        "rtd2_short",
-        "refrig_hi_temp",
-        "htc_fault",
-        "hi_fixed_temp_fault",
-        "lo_fixed_temp_fault",
-        "hi_temp_fault",
-        "lo_temp_fault",
-        "lo_level_fault",
-        "hi_temp_warn",
-        "lo_temp_warn",
-        "lo_level_warn",
-        "buzzer_on",
-        "alarm_muted",
-        "unit_faulted",
-        "unit_stopping",
-        "unit_on",
-        "pump_on",
-        "comp_on",
-        "heat_on",
-        "rtd2_controlling",
-        "heat_led_flashing",
-        "heat_led_on",
-        "cool_led_flashing",
-        "cool_led_on"
-    ]
-    return dict(zip(stati, fortybits))
+    return dict(zip(_STATI, fortybits))
     
 def enframe(cmd, dat=[], multidrop=False, addr=1):
     "Enframe query for NESLAB serial protocol, return bytelist."
@@ -100,15 +106,15 @@ def enframe(cmd, dat=[], multidrop=False, addr=1):
     if not isinstance(cmd, list): cmd = [cmd]
     
     if not multidrop: 
-        leadchar = 0xca # RS-232
-        addr = [0x00, 0x01]
+        leadchar = _LEAD_RS232 # RS-232
+        addr = _ADDR_RS232
     else: 
-        leadchar = 0xcc # RS-485/422
-        if addr in range(1, 64): addr = [0x00, addr] # prepend MSB
+        leadchar = _LEAD_RS485 # RS-485/422
+        if addr in range(1, 64): addr = (0x00, addr) # prepend MSB
         else: raise Exception("Multidrop address must be in range [1,64]")
         
     # build the bytelist
-    frame = [leadchar] + addr + cmd + [len(dat)] + dat
+    frame = [leadchar, *addr, *cmd, len(dat), *dat]
         
     # append checksum, excluding lead char
     return frame + [checksum(frame[1:])]
@@ -136,6 +142,10 @@ class NeslabController(TCal):
         self.__ser__.flush()
         self.__multidrop__ = multidrop
         self.__addr__ = addr
+        # scratch buffer for replies, reused across queries
+        # (max reply is 5 leader bytes + 255 data bytes + checkbyte)
+        self.__rxbuf__ = bytearray(261)
+        self.__rxview__ = memoryview(self.__rxbuf__)
         # initialize calibrations at unity
         # these can be adjusted by bath.cal_ext.reset(slope, xcept)
         self.cal_int = TCal(1, 0)
@@ -150,17 +160,20 @@ class NeslabController(TCal):
         self.__ser__.write(query)
         self.__ser__.flush()
         
-        # read full response
+        # read full response into the scratch buffer
         # starting with 4-byte leader and manifest byte
-        reply = []
-        reply += bytestr2bytelist(self.__ser__.read(5))
+        if self.__ser__.readinto(self.__rxview__[:5]) < 5:
+            raise serial.SerialException("Timed out waiting for reply.")
         # the last one is the number of data bytes
         # (plus the checkbyte)
-        reply += bytestr2bytelist(self.__ser__.read(reply[-1]+1))
+        end = 5 + self.__rxbuf__[4] + 1
+        if self.__ser__.readinto(self.__rxview__[5:end]) < end - 5:
+            raise serial.SerialException("Timed out waiting for reply.")
+        reply = self.__rxview__[:end]
         
         # parse the reply
-        leader = reply[:4] # lead char, address, and command
-        dbytes = reply[5:-1] # data bytes
+        leader = list(reply[:4]) # lead char, address, and command
+        dbytes = list(reply[5:-1]) # data bytes
         ckbyte = reply[-1] # checksum
         #print(list(reply)) #TEST
         # and calc correct checksum
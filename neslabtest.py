@@ -1,20 +1,29 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 
 """
 initialize Neslab water bath, then provide user with an interactive console for debugging
 """
 
 import neslabrte as rte
+import argparse
 import traceback
-import __future__
+from functools import lru_cache
 
-comport = raw_input("Which port? ")
-bath = rte.NeslabController(port=comport)
+@lru_cache(maxsize=256)
+def compile_cmd(cmd):
+    "Compile a console command once; repeated commands reuse the code object."
+    return compile("bath.{}".format(cmd), "<neslabtest>", "eval")
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--port", help="device address of NESLAB waterbath", default="/dev/cu.usbserial-FT4IVKAO0")
+args = parser.parse_args()
+
+bath = rte.NeslabController(port=args.port)
 
 while True:
-	cmd = raw_input("bath.")
-	try:
-	    print(eval("bath.{}".format(cmd)))
-	except:
-		traceback.print_exc()
-		bath.disconnect()
\ No newline at end of file
+    cmd = input("bath.")
+    try:
+        print(eval(compile_cmd(cmd)))
+    except:
+        traceback.print_exc()
+        bath.disconnect()
@@ -24,33 +24,40 @@ import numpy as np
 import pandas as pd
 #import matplotlib.pyplot as plt
 from sys import stderr
-from time import sleep
+from time import sleep, monotonic
 import binascii
+import re
+from functools import reduce, lru_cache
+from operator import xor
+
+# protocol control characters (parity bit set where needed)
+STX = b'\x02'
+ETX = b'\x83'
+EOT = b'\x04'
+ENQ = b'\x85'
+ACK = b'\x86'
+ETB = b'\x97'
     
 def bitstring_to_bytes(s):
     return int(s, 2).to_bytes(len(s) // 8, byteorder='big')
 
 def hex2dec(hex):
     "Convert Shimadzu's funky 24-bit hex to a decimal intensity value (-100 - 1000)"
-    # https://stackoverflow.com/questions/24563786/conversion-from-hex-to-signed-dec-in-python/32276534
-    hex = "0x" + hex
-    return -(int(hex, 16) & 0x800000) | (int(hex, 16) & 0x7fffff)
+    # parse the low 24 bits once, then sign-extend without branching
+    return (int(hex[-6:], 16) ^ 0x800000) - 0x800000
     
 def dec2hex(dec):
     "Reverse of the above"
-    # lop off the 0x
-    return hex(dec).upper()[2:]
+    # 24-bit two's complement, so negative readings round-trip
+    return "{:06X}".format(dec & 0xffffff)
     
 def pad_bytestring(byte_str, to_width, pad=b'\xb0', left=True):
     "Pad a bytestring to width with specified byte"
-    if left:
-        return b''.join([pad]*(to_width-len(byte_str))) + byte_str
-    else:
-        return byte_str + b''.join([pad]*(to_width-len(byte_str)))
+    return byte_str.rjust(to_width, pad) if left else byte_str.ljust(to_width, pad)
 
 # turn ASCII string into backslash-delimited hex values
 def ascii2hex(mystr):
-    return ''.join([("\\x" + hex(ord(ch))[2:]) for ch in list(mystr)])
+    return ''.join(map("\\x{:02x}".format, mystr.encode('ascii')))
     
 #def hex2ascii(hex):
 #    hex_string = hex[2:]
@@ -59,81 +66,150 @@ def ascii2hex(mystr):
 #
 #    return ascii_string
     
+# translation table that clears the parity bit
+_MASK7F = bytes(i & 0x7f for i in range(256))
+    
 def hex2ascii(bytelist):
     "Decode byte list to UTF-8, performing modulo"
-    return serial.to_bytes([byte%128 for byte in bytelist])
+    return bytes(bytelist).translate(_MASK7F)
+    
+# translation table that sets bit 7 for odd parity, as the spec expects
+_ODD_PARITY = bytes((i & 0x7f) | (0 if bin(i & 0x7f).count('1') % 2 else 0x80) for i in range(256))
+    
+def ascii2shim(text):
+    "Encode ASCII string to a bytelist with the spec's odd parity bit"
+    return list(text.encode('ascii').translate(_ODD_PARITY))
     
 def str2shim(msg):
-    "Enframe a message for the spec (bytelist), return a bytelist."
-    cmd = [0x02] + msg + [0x83]
-    return cmd + [shim_checksum(cmd)]
+    "Enframe a message for the spec (bytes or bytelist), return a bytestring."
+    return _enframe(bytes(msg))
     
+# framed commands, cached by payload
+@lru_cache(maxsize=256)
+def _enframe(payload):
+    frame = bytearray(STX)
+    frame += payload
+    frame += ETX
+    frame.append(shim_checksum(bytes(frame)))
+    return bytes(frame)
+    
+# replies repeat a lot during a run, so cache the decode (bytestr must be bytes)
+@lru_cache(maxsize=1024)
 def shim2str(bytestr):
-    "Take bytestring from the spec, checksum and strip it."
-    #NTS 20200719: True is temporary here!
-    if True or bytestr[-1] == shim_checksum(bytestr[:-1]):
-        # lop off first and last bytes (0x02, 0x83)
-        return hex2ascii(bytestr[:-1])[1:-1].decode(errors="ignore").strip()
-    else:
-        # if checksum fails
-        return None
+    "Take bytestring from the spec, checksum and strip it. Raise SerialException if the checksum fails."
+    if bytestr[-1] != shim_checksum(bytestr[:-1]):
+        raise serial.SerialException("Checksum failed on reply {!r}.".format(bytestr))
+    # lop off STX, ETX/ETB and checkbyte, then strip parity from the payload only
+    return hex2ascii(bytestr[1:-2]).decode(errors="ignore").strip()
     
+@lru_cache(maxsize=256)
 def shim_checksum(msg):
-    dict_stopgap = {
-        b'\x02W\xcd\x83'    : 0x19,
-        b'\x02#\x83'        : 0x20,
-        b'\x02E\x83'        : 0x46,
-        b'\x02\xd6\x83'     : 0xd5,
-        b'\x02CR\x83'       : 0x92,
-        b'\x02C\x83'        : 0x40,
-        b'\x02I\x83'        : 0x4a,
-        b'\x02\xce1\x83'    : 0x7c,
-        b'\x02\xce2\x83'    : 0x7f,
-        # data request
-        b'\x02R\x83'        : 0x51,
-        # WL check
-        b'\x02WX\x83'       : 0x8c,
-        b'\x02WM\x83'       : 0x19,
-        # WL set
-        b'\x02W\xc1\xb0\xc44811\xb62\x83'       : 0xe9,
-        b'\x02W\xc1\xb0\xc4\xc1C1\xb0\xb68\x83' : 0xec, # 350/420
-        b'\x02W\xc1\xb0\xc4\xc1C1\xb0\xc28\x83' : 0x98, # 350/428
-        b'\x02W\xc1\xb0\xc44811\xb3\xb0\x83'    : 0x6e,
-        b'\x02W\xc1\xb0\xc4481\xb324\x83'       : 0xe9,
-        b'\x02W\xc11\xb0\xb0411\xb3\xb0\x83'    : 0x13,
-        b'\x02W\xc11\xb0\xb041\xb324\x83'       : 0x94,
-        # ex slit
-        b'\x02\xd3X1\x83'       : 0xb9, # 1.5 nm
-        b'\x02\xd3X2\x83'       : 0xba, # 3 nm
-        b'\x02\xd3X\xb3\x83'    : 0x3b, # 5 nm
-        b'\x02\xd3X\xb5\x83'    : 0x3d, # 15 nm
-        b'\x02\xd3X\xb6\x83'    : 0x3e, # 20 nm
-        # em slit
-        b'\x02\xd3\xcd1\x83'    : 0x2c, # 1.5 nm
-        b'\x02\xd3\xcd2\x83'    : 0x2f, # 3 nm
-        b'\x02\xd3\xcd\xb3\x83' : 0xae, # 5 nm
-        b'\x02\xd3\xcd4\x83'    : 0x29, # 10 nm
-        b'\x02\xd3\xcd\xb6\x83' : 0xab, # 20 nm
-        b'\x02\xd3\xcd7\x83'    : 0x2a, # shut
-        # autozero
-        b'\x02X\x83'            : 0x5b,
-    }
-    return dict_stopgap[serial.to_bytes(msg)]
+    "Compute checkbyte for a framed message: XOR of all bytes after STX, with odd parity"
+    return _ODD_PARITY[reduce(xor, msg[1:], 0)]
+    
+# fixed commands, framed once at import
+_CMD_POST          = str2shim(b'\x23')
+_CMD_SER_NUM       = str2shim(b'\xd6')
+_CMD_ROM_VER       = str2shim(b'\x43\x52')
+_CMD_MEM_CHK       = str2shim(b'\x43')
+_CMD_OPT_CHK       = str2shim(b'\x49')
+_CMD_XEN_HRS       = str2shim(b'\x45')
+_CMD_SHUTTER_OPEN  = str2shim(b'\xce\x31')
+_CMD_SHUTTER_CLOSE = str2shim(b'\xce\x32')
+_CMD_ZERO          = str2shim(b'\x58')
+_CMD_WL_EX         = str2shim(b'\x57\x58')
+_CMD_WL_EM         = str2shim(b'\x57\xcd')
+_CMD_FLUOR         = str2shim(b'\x52')
+    
+# slit width (nm) -> wheel index
+_SLIT_EX = {
+    1.5    : 0x31,
+    3      : 0x32,
+    5      : 0xb3,
+    10     : 0x34,
+    15     : 0xb5,
+    20     : 0xb6,
+    6      : 0x37,
+    "6 HH" : 0x37,
+}
+_SLIT_EM = {
+    1.5    : 0x31,
+    3      : 0x32,
+    5      : 0xb3,
+    10     : 0x34,
+    15     : 0xb5,
+    20     : 0xb6,
+    0      : 0x37,
+    "shut" : 0x37,
+}
+# every slit setting, framed once
+_CMD_SLIT_EX = {slit: str2shim([0xd3, 0x58, idx]) for slit, idx in _SLIT_EX.items()}
+_CMD_SLIT_EM = {slit: str2shim([0xd3, 0xcd, idx]) for slit, idx in _SLIT_EM.items()}
+    
+# wavelength pairs recur across a run, so keep their framed commands
+@lru_cache(maxsize=32)
+def _wl_cmd(ex, em):
+    "Framed command to set ex/em wavelengths (nm); the spec takes tenths of nm in hex"
+    return str2shim(ascii2shim("WA{:04X}{:04X}".format(round(ex*10), round(em*10))))
+    
+# bounds on the pause between empty reads while waiting for a signal (s)
+_BACKOFF_MIN = 0.001
+_BACKOFF_MAX = 0.1
+    
+# ETB or ETX, either of which ends a block
+_TERMINATOR = re.compile(b'[' + ETB + ETX + b']')
+    
+# reply prefixes: a successful reply echoes '0' and the query,
+# so derive them from the framed commands (payload sits between STX and ETX)
+_PFX_POST    = '0' + hex2ascii(_CMD_POST[1:-2]).decode()
+_PFX_SER_NUM = '0' + hex2ascii(_CMD_SER_NUM[1:-2]).decode()
+_PFX_ROM_VER = '0' + hex2ascii(_CMD_ROM_VER[1:-2]).decode()
+_PFX_MEM_CHK = '0' + hex2ascii(_CMD_MEM_CHK[1:-2]).decode()
+_PFX_XEN_HRS = '0' + hex2ascii(_CMD_XEN_HRS[1:-2]).decode()
+_PFX_WL_EX   = '0' + hex2ascii(_CMD_WL_EX[1:-2]).decode()
+_PFX_WL_EM   = '0' + hex2ascii(_CMD_WL_EM[1:-2]).decode()
+# optics check replies echo the query without the '0'
+_PFX_OPT_CHK = hex2ascii(_CMD_OPT_CHK[1:-2]).decode()
+    
+# optics check codes in the reply, to my best inference
+_OPT_CHKPTS = {
+    'O' : "ex_slit_min",
+    'A' : "ex_slit_max",
+    'E' : "em_slit_min",
+    'S' : "em_slit_max",
+    'L' : "ex_mono_min",
+    'X' : "ex_mono_max",
+    'M' : "em_mono_min",
+    'B' : "em_mono_max"
+}
     
 def remove_prefix(text, prefix):
-    return text[text.startswith(prefix) and len(prefix):]
+    "Strip the echoed command from a reply; raise if the reply does not echo it."
+    if not text.startswith(prefix):
+        raise serial.SerialException("expected reply prefix {!r}, got {!r}".format(prefix, text))
+    return text[len(prefix):]
     
 class RF5301:
-    def __init__(self, port, baud=9600, timeout=1, exslit=None, emslit=None, shutstat=None):
+    def __init__(self, port, baud=9600, timeout=1, sigtimeout=10, exslit=None, emslit=None, shutstat=None):
         """
         Open serial interface, set remote status and baudrate.
         The serial handle becomes a public instance object.
+        timeout is the per-read serial timeout (s); sigtimeout is how long
+        to wait for a handshake signal before giving up (s).
         """
         self.__ser__ = serial.Serial(port=port, baudrate=baud, timeout=timeout)
+        self.sigtimeout = sigtimeout
         self.lock = threading.RLock()
+        # bytes read off the line but not yet consumed
+        self.__rxbuf__ = bytearray()
         
-        # clear the line
-        while(self.__ser__.read(1) == b'\x85'):
+        # clear the line: drop stale input, answering the spec if it's calling (ENQ)
+        self.__ser__.reset_input_buffer()
+        while True:
+            # give any pending bytes a moment to land, then take them all at once
+            sleep(0.05)
+            if ENQ not in self.__ser__.read(self.__ser__.in_waiting):
+                break
             self.ack(True)
         
         # has POST been run?
@@ -162,10 +238,10 @@ class RF5301:
         "Perform full Power On Self-Test. False checks whether POST already run, True runs it."
         with self.lock:
             if not status:
-                msg = [0x23]
+                msg = _CMD_POST
                 # reply of 1 means the spec was just turned on
                 # return of True means POST already performed
-                return not int(remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()))
+                return not int(remove_prefix(self.query(msg), _PFX_POST))
             else:
                 #for test_method in [self.mem_chk, self.ser_num, self.opt_chk, self.xen_hrs()]
                 post_dict = {
@@ -179,22 +255,22 @@ class RF5301:
     def ser_num(self):
         "Get instrument SN"
         with self.lock:
-            msg = [0xd6]
+            msg = _CMD_SER_NUM
             # strip 0 and the query from beginning of a successful reply
-            return remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode())
+            return remove_prefix(self.query(msg), _PFX_SER_NUM)
         
     def rom_ver(self):
         "Get instrument ROM version"
         with self.lock:
-            msg = [0x43, 0x52]
+            msg = _CMD_ROM_VER
             # strip 0 and the query from beginning of a successful reply
-            return float(remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()))
+            return float(remove_prefix(self.query(msg), _PFX_ROM_VER))
         
     def mem_chk(self):
         "self-check ROM, RAM, EEPROM"
         with self.lock:
-            msg = [0x43]
-            if remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()) == "R1":
+            msg = _CMD_MEM_CHK
+            if remove_prefix(self.query(msg), _PFX_MEM_CHK) == "R1":
                 return True
             else:
                 return False
@@ -202,39 +278,25 @@ class RF5301:
     def opt_chk(self):
         "Optical bench check: ex/em slits, monochromators, (BL stability?)"
         with self.lock:
-            msg = [0x49]
+            msg = _CMD_OPT_CHK
             # first element is successful receipt
-            status = [remove_prefix(x, hex2ascii(msg).decode()) for x in self.query(msg)[1:]]
-            prefixes = [x[0] for x in status]
-            vals = [x[-1] for x in status]
-            # dict defines codes in the reply, to my best inference
-            chkpts = {
-                'O' : "ex_slit_min",
-                'A' : "ex_slit_max",
-                'E' : "em_slit_min",
-                'S' : "em_slit_max",
-                'L' : "ex_mono_min",
-                'X' : "ex_mono_max",
-                'M' : "em_mono_min",
-                'B' : "em_mono_max"
-            }
-            return {chkpts[prefix] : (not int(val)) for prefix, val in zip(prefixes, vals)}
+            results = {}
+            for x in self.query(msg)[1:]:
+                x = remove_prefix(x, _PFX_OPT_CHK)
+                results[_OPT_CHKPTS[x[0]]] = not int(x[-1])
+            return results
         
     def xen_hrs(self):
         "Get hours on the Xe lamp. RETURNS 1 if optics not yet checked"
         with self.lock:
-            msg = [0x45]
-            return hex2dec(remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()))
+            msg = _CMD_XEN_HRS
+            return hex2dec(remove_prefix(self.query(msg), _PFX_XEN_HRS))
         
     def shutter(self, status=None):
         "Open (True) or close (False) the shutter"
         if status is not None:
             with self.lock:
-                msg = [0xce]
-                if status:
-                    msg.append(0x31)
-                else:
-                    msg.append(0x32)
+                msg = _CMD_SHUTTER_OPEN if status else _CMD_SHUTTER_CLOSE
                 ok = not int(self.query(msg))
                 if ok: self.shutstat = status
                 return ok
@@ -244,25 +306,14 @@ class RF5301:
     def zero(self):
         "Autozero the photometer"
         with self.lock:
-            msg = [0x58]
+            msg = _CMD_ZERO
             return not int(self.query(msg))
     
     def slit_ex(self, slit=None):
         "Set excitation slit"
-        slit2index = {
-            1.5    : 0x31,
-            3      : 0x32,
-            5      : 0xb3,
-            10     : 0x34,
-            15     : 0xb5,
-            20     : 0xb6,
-            6      : 0x37,
-            "6 HH" : 0x37,
-        }
         if slit is not None:
             with self.lock:
-                msg = [0xd3, 0x58]
-                msg.append(slit2index[slit])
+                msg = _CMD_SLIT_EX[slit]
                 success = not int(self.query(msg))
                 if success: self.exslit = slit
                 return success
@@ -272,20 +323,9 @@ class RF5301:
             
     def slit_em(self, slit=None):
         "Set emission slit"
-        slit2index = {
-            1.5    : 0x31,
-            3      : 0x32,
-            5      : 0xb3,
-            10     : 0x34,
-            15     : 0xb5,
-            20     : 0xb6,
-            0      : 0x37,
-            "shut" : 0x37,
-        }
         if slit is not None:
             with self.lock:
-                msg = [0xd3, 0xcd]
-                msg.append(slit2index[slit])
+                msg = _CMD_SLIT_EM[slit]
                 success = not int(self.query(msg))
                 if success: self.emslit = slit
                 return success
@@ -298,74 +338,36 @@ class RF5301:
         with self.lock:
             if wl is None:
                 # get wavelength
-                msg = [0x57, 0x58]
-                hex_str = remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode())
+                msg = _CMD_WL_EX
+                hex_str = remove_prefix(self.query(msg), _PFX_WL_EX)
                 return hex2dec(hex_str)/10
             else:
-                #NTS 20200718 not done yet!
                 # set wavelength
                 # they have to be set simultaneously, so read wl_em
-                wl_em = self.wl_em()
-                msg = [0x57] + [0xc1] + list(pad_bytestring(dec2hex(int(wl*10)).encode(), to_width=4)) + list(pad_bytestring(dec2hex(int(wl_em*10)).encode(), to_width=4))
-                print(str2shim(msg))
-                #return self.query(msg)
+                return self.wl_set(wl, self.wl_em())
             
     def wl_em(self, wl=None):
         "Get/set emission wavelength"
         with self.lock:
             if wl is None:
                 # get wavelength
-                msg = [0x57, 0xcd]
-                hex_str = remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode())
+                msg = _CMD_WL_EM
+                hex_str = remove_prefix(self.query(msg), _PFX_WL_EM)
                 return hex2dec(hex_str)/10
+            else:
+                # set wavelength
+                # they have to be set simultaneously, so read wl_ex
+                return self.wl_set(self.wl_ex(), wl)
             
-    ## Stopgap methods to establish common ex/em pairs
-    def wl_set_nadh(self):
-        "ex/em 340/445"
-        with self.lock:
-            msg = [0x57, 0xc1, 0xb0, 0xc4, 0x34, 0x38, 0x31, 0x31, 0xb6, 0x32]
-            return not int(self.query(msg))
-        
-    def wl_set_dph(self):
-        #"ex/em 350/420"
-        #with self.lock:
-        #    msg = [0x57, 0xc1, 0xb0, 0xc4, 0xc1, 0x43, 0x31, 0xb0, 0xb6, 0x38]
-        #    return not int(self.query(msg))
-        "ex/em 350/428"
-        with self.lock:
-            msg = [0x57, 0xc1, 0xb0, 0xc4, 0xc1, 0x43, 0x31, 0xb0, 0xc2, 0x38]
-            return not int(self.query(msg))
-        
-    def wl_set_340_440(self):
-        "ex/em 340/440"
-        with self.lock:
-            msg = [0x57, 0xc1, 0xb0, 0xc4, 0x34, 0x38, 0x31, 0x31, 0xb3, 0xb0]
-            return not int(self.query(msg))
-        
-    def wl_set_340_490(self):
-        "ex/em 340/490"
-        with self.lock:
-            msg = [0x57, 0xc1, 0xb0, 0xc4, 0x34, 0x38, 0x31, 0xb3, 0x32, 0x34]
-            return not int(self.query(msg))
-            
-    def wl_set_410_440(self):
-        "ex/em 340/440"
+    def wl_set(self, ex, em):
+        "Set excitation and emission wavelengths (nm) together"
         with self.lock:
-            # checksum 0x13
-            msg = [0x57, 0xc1, 0x31, 0xb0, 0xb0, 0x34, 0x31, 0x31, 0xb3, 0xb0]
-            return not int(self.query(msg))
-        
-    def wl_set_410_490(self):
-        "ex/em 340/490"
-        with self.lock:
-            # checksum 0x94
-            msg = [0x57, 0xc1, 0x31, 0xb0, 0xb0, 0x34, 0x31, 0xb3, 0x32, 0x34]
-            return not int(self.query(msg))
+            return not int(self.query(_wl_cmd(ex, em)))
         
     def fluor_get(self):
         "Request fluorescence reading"
         with self.lock:
-            msg = [0x52]
+            msg = _CMD_FLUOR
             # there's a NUL between prefix and data!! Why is beyond me at present.
             # it's a pad. Should I replace it with 0 (0x30)?
             #print(self.query(msg))
@@ -386,15 +388,17 @@ class RF5301:
     
         
     # SOFTWARE HANDSHAKING METHODS
-    def query(self, msg):
-        "Enframe query (presently bytelist), send to instrument, return reply"
+    def handshake(self, msg):
+        "Send query (bytelist or framed bytestring) and hand the line over for the reply"
         with self.lock:
-            self.__ser__.flush()
+            # no output flush needed: the previous exchange ended with the
+            # spec answering our last send, so the line is already drained
             # hello?
             self.enq(True)
             self.ack(False)
             # now send the command
-            self.__ser__.write(str2shim(msg))
+            # (pre-framed bytestrings go out as-is)
+            self.__ser__.write(msg if isinstance(msg, bytes) else str2shim(msg))
             # wait for ack
             self.ack(False)
             # send EOT
@@ -403,11 +407,16 @@ class RF5301:
             self.enq(False)
             # send ACK
             self.ack(True)
+            
+    def query(self, msg):
+        "Enframe query (bytelist or framed bytestring), send to instrument, return reply"
+        with self.lock:
+            self.handshake(msg)
             # read blocks to EOT
             blocks = []
             while True:
                 blocks.append(self.read_block())
-                if blocks[-1][-2] == ord(b'\x83'):
+                if blocks[-1][-2] == ETX[0]:
                     break
             # wait for EOT to clear the line
             self.eot(False)
@@ -418,50 +427,66 @@ class RF5301:
                 return shim2str(blocks[0])
                 
     def querygen(self, msg):
-        "Enframe query (presently bytelist), send to instrument, YIELD reply"
+        "Enframe query (bytelist or framed bytestring), send to instrument, YIELD reply"
         with self.lock:
-            self.__ser__.flush()
-            # hello?
-            self.enq(True)
-            self.ack(False)
-            # now send the command
-            self.__ser__.write(str2shim(msg))
-            # wait for ack
-            self.ack(False)
-            # send EOT
-            self.eot(True)
-            # wait for ENQ (=CTR)
-            self.enq(False)
-            # send ACK
-            self.ack(True)
+            self.handshake(msg)
             # read blocks to EOT
-            blocks = []
             while True:
                 block = self.read_block()
-                yield shim2str(block)
-                # read_block() will pass an EOT straight thru
-                if block == ord(b'\x84'): return
-            # wait for EOT to clear the line?
+                try:
+                    reply = shim2str(block)
+                except serial.SerialException:
+                    # read out the rest of the reply so the line is clear, then report
+                    while block[-2] != ETX[0]:
+                        block = self.read_block()
+                    self.eot(False)
+                    raise
+                yield reply
+                # the last block ends with ETX
+                if block[-2] == ETX[0]:
+                    break
+            # wait for EOT to clear the line
             self.eot(False)
             
+    def receive(self):
+        "Append whatever has arrived to the receive buffer, waiting for at least one byte. Return byte count."
+        with self.lock:
+            data = self.__ser__.read(self.__ser__.in_waiting or 1)
+            self.__rxbuf__.extend(data)
+            return len(data)
+            
+    def poll(self, deadline, backoff, what):
+        "Receive more bytes before deadline (raise SerialTimeoutException if passed); return next backoff"
+        with self.lock:
+            if monotonic() > deadline:
+                raise serial.SerialTimeoutException("Timed out waiting for {}.".format(what))
+            if self.receive():
+                return _BACKOFF_MIN
+            # empty read (nonblocking port or read timeout): don't spin
+            sleep(backoff)
+            return min(2*backoff, _BACKOFF_MAX)
+            
     def read_block(self):
         "Read block terminated with ETB or ETX, return bytestring"
         with self.lock:
-            block = b''
+            buf = self.__rxbuf__
+            deadline = monotonic() + self.sigtimeout
+            backoff = _BACKOFF_MIN
             while True:
-                # WAIT for that first byte!
-                while not block: block += self.__ser__.read(1)
-                # after that, just try once 
-                if block: block += self.__ser__.read(1)
-                if block[-1] in [ord(sig) for sig in [b'\x97', b'\x83']]:
-                    # get the checkbyte
-                    block += self.__ser__.read(1)
+                term = _TERMINATOR.search(buf)
+                # block is complete once the checkbyte is in
+                if term and len(buf) > term.end():
+                    block = bytes(buf[:term.end()+1])
+                    # anything past the checkbyte stays buffered
+                    del buf[:term.end()+1]
                     # ACK receipt
                     self.ack(True)
                     return block
+                backoff = self.poll(deadline, backoff, "end of block")
     
     # signal senders/receivers
     # passing True sends the signal, False waits to receive it
+    # (signal takes the lock, so the wrappers below needn't)
     def signal(self, send, sig):
         with self.lock:
             if send:
@@ -470,31 +495,37 @@ class RF5301:
                 self.wait_for(sig)
     
     def wait_for(self, sig):
+        "Wait for signal; raise SerialTimeoutException if it doesn't come within sigtimeout."
         with self.lock:
-            while self.__ser__.read(1) != sig:
-                pass
+            buf = self.__rxbuf__
+            deadline = monotonic() + self.sigtimeout
+            backoff = _BACKOFF_MIN
+            while True:
+                i = buf.find(sig)
+                if i >= 0:
+                    # consume through the signal, keep what follows
+                    del buf[:i+1]
+                    return
+                # nothing before the signal is of use
+                buf.clear()
+                backoff = self.poll(deadline, backoff, sig)
     
     def ack(self, send=True):
         "Send or recieve ACK"
-        with self.lock:
-            self.signal(send, b'\x86')
+        self.signal(send, ACK)
                         
     def enq(self, send=True):
         "Send or recieve ENQ"
-        with self.lock:
-            self.signal(send, b'\x85')
+        self.signal(send, ENQ)
         
     def etb(self, send=True):
         "Send or recieve ETB"
-        with self.lock:
-            self.signal(send, b'\x97')
+        self.signal(send, ETB)
             
     def etx(self, send=True):
         "Send or recieve ETX"
-        with self.lock:
-            self.signal(send, b'\x83')
+        self.signal(send, ETX)
         
     def eot(self, send=True):
         "Send or recieve EOT"
-        with self.lock:
-            self.signal(send, b'\x04')
\ No newline at end of file
+        self.signal(send, EOT)
\ No newline at end of file
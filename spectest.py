@@ -6,6 +6,12 @@ initialize Isotemp water bath, then provide user with an interactive console for
 
 import rf5301
 import traceback
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def compile_cmd(cmd):
+    "Compile a console command once; repeated commands reuse the code object."
+    return compile("spec.{}".format(cmd), "<spectest>", "eval")
 
 #spec = rf5301.RF5301(port="/dev/cu.usbserial-FTV5C58R0")
 spec = rf5301.RF5301(port="/dev/cu.usbserial-FT4IVKAO0")
@@ -13,7 +19,7 @@ spec = rf5301.RF5301(port="/dev/cu.usbserial-FT4IVKAO0")
 while True:
     cmd = input("spec.")
     try:
-        ret = eval("spec.{}".format(cmd))
+        ret = eval(compile_cmd(cmd))
         print(ret)
     except:
         spec.__ser__.flush()
@@ -43,6 +43,9 @@ class AuxMCU:
         self.lock = threading.RLock()
         self.filt_ex = filt_ex
         self.filt_em = filt_em
+        # filter name -> wheel position
+        self.__idx_ex__ = {filt: i for i, filt in enumerate(filt_ex or [])}
+        self.__idx_em__ = {filt: i for i, filt in enumerate(filt_em or [])}
         
         self.lamp(False)
         # wheels_init() can be called later if desired for interface reasons
@@ -74,45 +77,40 @@ class AuxMCU:
         self.__ser__.reset_output_buffer()
         self.__ser__.close()
         
+    def txrx(self, cmd):
+        "Send command (bytes), return its reply line with line ending stripped"
+        with self.lock:
+            # flush input, so a stale reply can't be mistaken for this one
+            self.__ser__.reset_input_buffer()
+            self.__ser__.write(cmd)
+            # returns as soon as the terminator is in, or on timeout
+            return self.__ser__.read_until(b'\r\n').rstrip()
+        
     # setter/getters
     
     def ex(self, filt=None):
         "Command or query the excitation filter wheel"
         if filt is not None:
-        	# flush I/O
-            self.__ser__.flush()
-            self.__ser__.write("EX{}\n".format(self.filt_ex.index(filt)).encode())
-            if str2float(self.__ser__.read_until('\r\n').rstrip()):
-            	self.pos_ex = fr_to[1]
+            if str2float(self.txrx("EX{}\n".format(self.__idx_ex__[filt]).encode())):
+            	self.pos_ex = self.__idx_ex__[filt]
         # return the actual position
-        return self.filt_em[self.pos_ex]
+        return self.filt_ex[self.pos_ex]
         
     def em(self, filt=None):
         "Command or query the emission filter wheel"
         if filt is not None:
-        	# flush I/O
-            self.__ser__.flush()
-            self.__ser__.write("EM{}\n".format(self.filt_em.index(filt)).encode())
-            if str2float(self.__ser__.read_until('\r\n').rstrip()):
-            	self.pos_em = fr_to[1]
+            if str2float(self.txrx("EM{}\n".format(self.__idx_em__[filt]).encode())):
+            	self.pos_em = self.__idx_em__[filt]
         # return the actual position
         return self.filt_em[self.pos_em]
         
     def lamp(self, status=None):
         "Command or query the spec lamp interlock"
-        self.__ser__.read_all() # can use for something later if I want
         if status is not None:
             if status: 
-                self.__ser__.write("LON\n".encode())
-                self.lamp_status = str2bool(self.__ser__.read_until('\r\n').rstrip())
-                # can timeout be avoided with blocking reads?
-                #self.lamp_status = str2bool(self.__ser__.read(3).rstrip())
+                self.lamp_status = str2bool(self.txrx(b"LON\n"))
             else: 
-                self.__ser__.write("LOF\n".encode())
-                self.lamp_status = str2bool(self.__ser__.read_until('\r\n').rstrip())
-                #self.lamp_status = str2bool(self.__ser__.read(3).rstrip())
-            # flush I/O
-            self.__ser__.flush()
+                self.lamp_status = str2bool(self.txrx(b"LOF\n"))
         return self.lamp_status
         
     def temp_get(self):
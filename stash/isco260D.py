@@ -40,7 +40,7 @@ def dasnet2str(frame):
     frame = frame.decode().rstrip()
     ack = frame[0]
     dest = frame[1]
-    len_msg = eval("0x{}".format(frame[2:4]))
+    len_msg = int(frame[2:4], 16)
     msg = frame[4:-2]
     checksum = frame[-2:]
     # check message integrity
@@ -5,7 +5,7 @@ run a set number of program reps on the ISCO pump
 """
 
 import isco260D as isco
-from time import sleep
+from time import sleep, monotonic
 
 def gg2psi(gg_str):
 	"get PSI value from G& get all status string"
@@ -24,7 +24,8 @@ for i in range(n):
 	pump.run()
 	psi_hi = 0
 	maxed = False
-	# monitor pressure every second
+	# monitor pressure every second, on absolute ticks so the loop doesn't drift
+	next_tick = monotonic()
 	for j in range(t):
 		psi = gg2psi(pump.gg())
 		if psi > psi_hi:
@@ -32,7 +33,8 @@ for i in range(n):
 		elif (maxed == False) and (psi < (psi_hi - 5)):
 			print ("max pressure: {} PSI".format(psi_hi))
 			maxed = True
-		sleep(1)
+		next_tick += 1
+		sleep(max(0, next_tick - monotonic()))
 	# re-arm pump
 	pump.run()
 	print("cycle {} complete".format(i+1))
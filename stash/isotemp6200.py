@@ -263,6 +263,15 @@ class IsotempController(TCal):
         self.__ser__.flush()
         return(str2float(self.__ser__.read_until('\r')))
             
+    def temp_get_both(self):
+        "Get current temps at internal and external sensors in one exchange."
+        # both queries go out in one write; the replies come back in order
+        self.__ser__.write(b"RT\rRT2\r")
+        self.__ser__.flush()
+        temp_int = str2float(self.__ser__.read_until(b'\r'))
+        temp_ext = str2float(self.__ser__.read_until(b'\r'))
+        return(temp_int, temp_ext)
+            
     def temp_get_act(self, ext=None):
         "Get calibrated temp, by default from active sensor."
         # if sensor not specified, use the active one
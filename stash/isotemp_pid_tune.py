@@ -23,11 +23,35 @@ import time
 import configparser
 import numpy as np
 from math import isclose
+from collections import deque
 import isotemp6200 as isotemp
 
 # get all temperature steps
 temps = np.arange(*[float(x) for x in (temp_start, temp_end, temp_step)]).tolist()
 
+# rows are written and flushed in batches of this many,
+# or at least this often (s) so live plots don't lag
+log_batch = 64
+log_interval = 1
+rows = []
+last_flush = time.monotonic()
+# t, T_int, T_ext, p, i, d
+row_fmt = "\t".join(["{}"]*6)+'\n'
+
+def log_row(*vals):
+    "Queue a row for the log; write and flush once a batch has built up"
+    rows.append(row_fmt.format(*vals))
+    if len(rows) >= log_batch or time.monotonic() - last_flush > log_interval:
+        flush_log()
+
+def flush_log():
+    "Write out and flush any queued rows"
+    global last_flush
+    hand_log.write(''.join(rows))
+    hand_log.flush()
+    rows.clear()
+    last_flush = time.monotonic()
+
 # open unbuffered output file
 with open(file_log, 'w') as hand_log:
 
@@ -43,7 +67,7 @@ with open(file_log, 'w') as hand_log:
         ## run experiment
         
         # start experiment timer (i.e. stopwatch)
-        time_start = time.time()
+        time_start = time.monotonic_ns()
         
         # start circulator
         while not bath.on():
@@ -62,6 +86,7 @@ with open(file_log, 'w') as hand_log:
         
         # scan across temp
         for temp_set in temps:
+            flush_log()
             
             # set temp persistently
             while not isclose(bath.temp_set(), temp_set):
@@ -71,18 +96,14 @@ with open(file_log, 'w') as hand_log:
             temp_ext = bath.temp_get_ext()
             if round(temp_ext, 1) > temp_set:
                 while temp_ext > temp_set:
-                    time_act = time.time() - time_start
-                    temp_int = bath.temp_get_int()
-                    temp_ext = bath.temp_get_ext()
-                    hand_log.write("\t".join([str(x) for x in [round(time_act, 3), temp_int, temp_ext, p, i, d]])+'\n')
-                    hand_log.flush()
+                    time_act = (time.monotonic_ns() - time_start) * 1e-9
+                    temp_int, temp_ext = bath.temp_get_both()
+                    log_row(round(time_act, 3), temp_int, temp_ext, p, i, d)
             else:
                 while round(temp_ext, 1) < temp_set:
-                    time_act = time.time() - time_start
-                    temp_int = bath.temp_get_int()
-                    temp_ext = bath.temp_get_ext()
-                    hand_log.write("\t".join([str(x) for x in [round(time_act, 3), temp_int, temp_ext, p, i, d]])+'\n')
-                    hand_log.flush()
+                    time_act = (time.monotonic_ns() - time_start) * 1e-9
+                    temp_int, temp_ext = bath.temp_get_both()
+                    log_row(round(time_act, 3), temp_int, temp_ext, p, i, d)
                     
             # reset all bands
             i = d = 0
@@ -95,30 +116,30 @@ with open(file_log, 'w') as hand_log:
                 for drive in ('H', 'C'):
                     while not all(bath.pid(drive, p, i, d)):
                         pass
-                peaks = []
-                valleys = []
-                trail = [bath.temp_get_ext()] * 3
-                start_tune = time.time()
+                # rolling windows; appending past maxlen drops the oldest
+                peaks = deque(maxlen=num_osc)
+                valleys = deque(maxlen=num_osc)
+                trail = deque([bath.temp_get_ext()] * 3, maxlen=3)
+                # same clock as time_act, so the timeout test compares like with like
+                start_tune = (time.monotonic_ns() - time_start) * 1e-9
                 while True:
-                    time_act = time.time() - time_start
-                    temp_int = bath.temp_get_int()
-                    temp_ext = bath.temp_get_ext()
+                    time_act = (time.monotonic_ns() - time_start) * 1e-9
+                    temp_int, temp_ext = bath.temp_get_both()
                     # log the data
-                    hand_log.write("\t".join([str(x) for x in [round(time_act, 3), temp_int, temp_ext, p, i, d]])+'\n')
-                    hand_log.flush()
+                    log_row(round(time_act, 3), temp_int, temp_ext, p, i, d)
                     
                     if temp_ext != trail[-1]:
                         # temp must have changed detectably
-                        trail = trail[1:] + [temp_ext]
-                        print("trace: {}".format(trail), file=sys.stderr)
+                        trail.append(temp_ext)
+                        print("trace: {}".format(list(trail)), file=sys.stderr)
                         
                         # store each peak and valley
                         if trail[-1] < trail[-2] and trail[-3] < trail[-2]:
                             peaks.append(trail[-2])
-                            print("peaks: {}\nvalleys: {}".format(peaks, valleys), file=sys.stderr)
+                            print("peaks: {}\nvalleys: {}".format(list(peaks), list(valleys)), file=sys.stderr)
                         elif trail[-1] > trail[-2] and trail[-3] > trail[-2]:
                             valleys.append(trail[-2])
-                            print("peaks: {}\nvalleys: {}".format(peaks, valleys), file=sys.stderr)
+                            print("peaks: {}\nvalleys: {}".format(list(peaks), list(valleys)), file=sys.stderr)
                         
                         if (min(len(peaks), len(valleys)) == num_osc):
                         	# if enough oscillations have happened
@@ -132,9 +153,9 @@ with open(file_log, 'w') as hand_log:
                             # or we're just out of time
                                 good = False
                                 break
-                            # limit trail to num_osc
-                            peaks = peaks[1:]
-                            valleys = valleys[1:]
+                            # start the next window
+                            peaks.popleft()
+                            valleys.popleft()
                 if good: 
                     # if p is adequate, move on
                     break
@@ -145,26 +166,27 @@ with open(file_log, 'w') as hand_log:
                 for drive in ('H', 'C'):
                     while not all(bath.pid(drive, p, i, d)):
                         pass
-                peaks = valleys = []
-                trail = [0] * 3
-                start_tune = time.time()
+                # separate windows, so peaks and valleys fill independently
+                peaks = deque(maxlen=num_osc)
+                valleys = deque(maxlen=num_osc)
+                trail = deque([0] * 3, maxlen=3)
+                # same clock as time_act, so the timeout test compares like with like
+                start_tune = (time.monotonic_ns() - time_start) * 1e-9
                 while True:
-                    time_act = time.time() - time_start
-                    temp_int = bath.temp_get_int()
-                    temp_ext = bath.temp_get_ext()
+                    time_act = (time.monotonic_ns() - time_start) * 1e-9
+                    temp_int, temp_ext = bath.temp_get_both()
                     # log the data
-                    hand_log.write("\t".join([str(x) for x in [round(time_act, 3), temp_int, temp_ext, p, i, d]])+'\n')
-                    hand_log.flush()
+                    log_row(round(time_act, 3), temp_int, temp_ext, p, i, d)
                     
                     if temp_ext != trail[-1]:
                         # temp must have changed detectably
-                        trail = trail[1:] + [temp_ext]
+                        trail.append(temp_ext)
                         
                     # log each peak and valley
                     if trail[-1] < trail[-2] and trail[-3] < trail[-2]:
-                        peaks.append(temp_ext)
+                        peaks.append(trail[-2])
                     elif trail[-1] > trail[-2] and trail[-3] > trail[-2]:
-                        peaks.append(temp_int)
+                        valleys.append(trail[-2])
                     
                     if (min(len(peaks), len(valleys)) == num_osc):
                         if ((max(peaks) - min(peaks) <= temp_tol) and
@@ -176,9 +198,9 @@ with open(file_log, 'w') as hand_log:
                         elif (time_act - start_tune) > timeout:
                             amp.append(mean(peaks) - mean(valleys))
                             break
-                        # limit trail to num_osc
-                        peaks = peaks[1:]
-                        valleys = valleys[1:]
+                        # start the next window
+                        peaks.popleft()
+                        valleys.popleft()
                 try:
                     if (amp[2] > amp[1]) and (amp[3] > amp [1]):
                         # if the first setting was stablest of 3,
@@ -203,26 +225,27 @@ with open(file_log, 'w') as hand_log:
                 for drive in ('H', 'C'):
                     while not all(bath.pid(drive, p, i, d)):
                         pass
-                peaks = valleys = []
-                trail = [0] * 3
-                start_tune = time.time()
+                # separate windows, so peaks and valleys fill independently
+                peaks = deque(maxlen=num_osc)
+                valleys = deque(maxlen=num_osc)
+                trail = deque([0] * 3, maxlen=3)
+                # same clock as time_act, so the timeout test compares like with like
+                start_tune = (time.monotonic_ns() - time_start) * 1e-9
                 while True:
-                    time_act = time.time() - time_start
-                    temp_int = bath.temp_get_int()
-                    temp_ext = bath.temp_get_ext()
+                    time_act = (time.monotonic_ns() - time_start) * 1e-9
+                    temp_int, temp_ext = bath.temp_get_both()
                     # log the data
-                    hand_log.write("\t".join([str(x) for x in [round(time_act, 3), temp_int, temp_ext, p, i, d]])+'\n')
-                    hand_log.flush()
+                    log_row(round(time_act, 3), temp_int, temp_ext, p, i, d)
                     
                     if temp_ext != trail[-1]:
                         # temp must have changed detectably
-                        trail = trail[1:] + [temp_ext]
+                        trail.append(temp_ext)
                         
                     # log each peak and valley
                     if trail[-1] < trail[-2] and trail[-3] < trail[-2]:
-                        peaks.append(temp_ext)
+                        peaks.append(trail[-2])
                     elif trail[-1] > trail[-2] and trail[-3] > trail[-2]:
-                        peaks.append(temp_int)
+                        valleys.append(trail[-2])
                     
                     if (min(len(peaks), len(valleys)) == num_osc):
                         if (mean(peaks) - mean(valleys) <= 2*temp_tol):
@@ -233,9 +256,9 @@ with open(file_log, 'w') as hand_log:
                         elif (time_act - start_tune) > timeout:
                             amp.append(mean(peaks) - mean(valleys))
                             break
-                        # limit trail to num_osc
-                        peaks = peaks[1:]
-                        valleys = valleys[1:]
+                        # start the next window
+                        peaks.popleft()
+                        valleys.popleft()
                 try:
                     if (amp[2] > amp[1]) and (amp[3] > amp [1]):
                         # if the first setting was stablest of 3,
@@ -255,9 +278,11 @@ with open(file_log, 'w') as hand_log:
                     pass
 
         # shut down when done
+        flush_log()
         bath.on(False)
         bath.disconnect()
 
     except:
+        flush_log()
         bath.disconnect()
         traceback.print_exc()
\ No newline at end of file
@@ -58,9 +58,12 @@ def ascii2hex(mystr):
 #
 #    return ascii_string
     
+# translation table that clears the parity bit
+_MASK7F = bytes(i & 0x7f for i in range(256))
+
 def hex2ascii(bytelist):
     "Decode byte list to UTF-8, performing modulo"
-    return serial.to_bytes([byte%128 for byte in bytelist])
+    return bytes(bytelist).translate(_MASK7F)
     
 def str2shim(msg):
     "Enframe a message for the spec (bytelist), return a bytelist."
@@ -102,7 +105,20 @@ def shim_checksum(msg):
     return dict_stopgap[serial.to_bytes(msg)]
     
 def remove_prefix(text, prefix):
-    return text[text.startswith(prefix) and len(prefix):]
+    "Strip the echoed command from a reply; raise if the reply does not echo it."
+    if not text.startswith(prefix):
+        raise serial.SerialException("expected reply prefix {!r}, got {!r}".format(prefix, text))
+    return text[len(prefix):]
+
+# successful replies echo '0' and the command
+_PFX_POST    = '0#'
+_PFX_SER_NUM = '0V'
+_PFX_ROM_VER = '0CR'
+_PFX_MEM_CHK = '0C'
+_PFX_OPT_CHK = 'I'
+_PFX_XEN_HRS = '0E'
+_PFX_WL_EX   = '0WX'
+_PFX_WL_EM   = '0WM'
     
 class RF5301:
     def __init__(self, port, baud=9600, timeout=1):
@@ -131,7 +147,7 @@ class RF5301:
             msg = [0x23]
             # reply of 1 means the spec was just turned on
             # return of True means POST already performed
-            return not int(remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()))
+            return not int(remove_prefix(self.query(msg), _PFX_POST))
         else:
             post_dict = {
                 "mem_chk" : self.mem_chk(),
@@ -145,18 +161,18 @@ class RF5301:
         "Get instrument SN"
         msg = [0xd6]
         # strip 0 and the query from beginning of a successful reply
-        return remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode())
+        return remove_prefix(self.query(msg), _PFX_SER_NUM)
         
     def rom_ver(self):
         "Get instrument ROM version"
         msg = [0x43, 0x52]
         # strip 0 and the query from beginning of a successful reply
-        return float(remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()))
+        return float(remove_prefix(self.query(msg), _PFX_ROM_VER))
         
     def mem_chk(self):
         "self-check ROM, RAM, EEPROM"
         msg = [0x43]
-        if remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()) == "R1":
+        if remove_prefix(self.query(msg), _PFX_MEM_CHK) == "R1":
             return True
         else:
             return False
@@ -165,7 +181,7 @@ class RF5301:
         "Optical bench check: ex/em slits, monochromators, (BL stability?)"
         msg = [0x49]
         # first element is successful receipt
-        status = [remove_prefix(x, hex2ascii(msg).decode()) for x in self.query(msg)[1:]]
+        status = [remove_prefix(x, _PFX_OPT_CHK) for x in self.query(msg)[1:]]
         prefixes = [x[0] for x in status]
         vals = [x[-1] for x in status]
         # dict defines codes in the reply, to my best inference
@@ -184,7 +200,7 @@ class RF5301:
     def xen_hrs(self):
         "Get hours on the Xe lamp. RETURNS 1 if optics not yet checked"
         msg = [0x45]
-        return hex2dec(remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode()))
+        return hex2dec(remove_prefix(self.query(msg), _PFX_XEN_HRS))
         
     def shutter(self, status):
         "Open (True) or close (False) the shutter"
@@ -200,7 +216,7 @@ class RF5301:
         if wl is None:
             # get wavelength
             msg = [0x57, 0x58]
-            hex_str = remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode())
+            hex_str = remove_prefix(self.query(msg), _PFX_WL_EX)
             return hex2dec(hex_str)/10
         else:
             #NTS 20200718 not done yet!
@@ -216,7 +232,7 @@ class RF5301:
         if wl is None:
             # get wavelength
             msg = [0x57, 0xcd]
-            hex_str = remove_prefix(self.query(msg), '0'+hex2ascii(msg).decode())
+            hex_str = remove_prefix(self.query(msg), _PFX_WL_EM)
             return hex2dec(hex_str)/10
             
     ## Stopgap methods to establish common ex/em pairs
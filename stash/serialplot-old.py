@@ -4,7 +4,6 @@ file_data = "/Applications/spectackler/20200714_t-log.tsv"
 
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-import pandas as pd
 
 # Create figure for plotting
 fig = plt.figure()
@@ -14,28 +13,47 @@ temp_ext = []
 temp_int = []
 temp_set = []
 
+# one persistent line per series, updated in place
+line_ext, = ax.plot([], [], c="red")
+line_int, = ax.plot([], [], c="green")
+line_set, = ax.plot([], [], c="yellow")
+
+# Format plot
+plt.xticks(rotation=45, ha='right')
+plt.subplots_adjust(bottom=0.30)
+#plt.title('TMP102 Temperature over Time')
+plt.ylabel('Temperature (deg C)')
+
+# keep the log open and only parse what has been appended since the last frame
+f_data = open(file_data, 'r')
+header = f_data.readline().rstrip('\n').split('\t')
+usecols = [header.index(col) for col in ('watch', 'T_ext', 'T_int', 'T_set')]
+tail = ''
+
 # This function is called periodically from FuncAnimation
-def animate(i, t, temp_ext, temp_int, temp_set):
-	
-    data = pd.read_csv(file_data, sep='\t')
-
-    t = data['watch']
-    temp_ext = data['T_ext']
-    temp_int = data['T_int']
-    temp_set = data['T_set']
-
-    # Draw x and y lists
-    ax.clear()
-    ax.plot(t, temp_ext, c="red")
-    ax.plot(t, temp_int, c="green")
-    ax.plot(t, temp_set, c="yellow")
-
-    # Format plot
-    plt.xticks(rotation=45, ha='right')
-    plt.subplots_adjust(bottom=0.30)
-    #plt.title('TMP102 Temperature over Time')
-    plt.ylabel('Temperature (deg C)')
+def animate(i):
+    global tail
+    
+    # the last piece is a partial line (or empty); hold it for next time
+    chunk = (tail + f_data.read()).split('\n')
+    tail = chunk.pop()
+    for row in chunk:
+        fields = row.split('\t')
+        for series, col in zip((t, temp_ext, temp_int, temp_set), usecols):
+            series.append(float(fields[col]))
+
+    line_ext.set_data(t, temp_ext)
+    line_int.set_data(t, temp_int)
+    line_set.set_data(t, temp_set)
+    
+    # blitting only redraws the lines; if the view had to grow, redraw the axes too
+    lims = (ax.get_xlim(), ax.get_ylim())
+    ax.relim()
+    ax.autoscale_view()
+    if (ax.get_xlim(), ax.get_ylim()) != lims:
+        fig.canvas.draw_idle()
+    return line_ext, line_int, line_set
 
 # Set up plot to call animate() function periodically
-ani = animation.FuncAnimation(fig, animate, fargs=(t, temp_ext, temp_int, temp_set), interval=1000)
+ani = animation.FuncAnimation(fig, animate, interval=1000, blit=True)
 plt.show()
\ No newline at end of file
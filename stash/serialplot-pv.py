@@ -4,33 +4,54 @@ file_data = "data/20200712_viscotest.tsv"
 
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-import pandas as pd
 
 # Create figure for plotting
 fig = plt.figure()
 ax = fig.add_subplot(1, 1, 1)
+# one persistent artist, updated in place each frame
+trace, = ax.plot([], [], linestyle='-', marker='o', c="black")
+plt.xlabel('Temperature (deg C)')
+plt.ylabel('Pressure (bar)')
+
+# keep the log open and only parse what has been appended since the last frame
+f_data = open(file_data, 'r')
+header = f_data.readline().rstrip('\n').split('\t')
+i_temp = header.index('temp_act')
+i_pres = header.index('pres_act')
 temp = []
 pres = []
+tail = ''
 
 # This function is called periodically from FuncAnimation
-def animate(i, temp, pres):
-	
-    data = pd.read_csv(file_data, sep='\t')
-
-    temp = data['temp_act']
-    pres = data['pres_act']
-
-    # Draw x and y lists
-    ax.clear()
-    ax.plot(temp, pres, linestyle='-', marker='o', c="black")
+def animate(i):
+    global tail
+    
+    # the last piece is a partial line (or empty); hold it for next time
+    chunk = (tail + f_data.read()).split('\n')
+    tail = chunk.pop()
+    # nothing new, so the plot is already current
+    if not chunk:
+        return trace,
+    for row in chunk:
+        fields = row.split('\t')
+        temp.append(float(fields[i_temp]))
+        pres.append(float(fields[i_pres]))
+
+    trace.set_data(temp, pres)
+    
+    # blitting only redraws the trace; if the view had to grow, redraw the axes too
+    lims = (ax.get_xlim(), ax.get_ylim())
+    ax.relim()
+    ax.autoscale_view()
+    if (ax.get_xlim(), ax.get_ylim()) != lims:
+        fig.canvas.draw_idle()
 
     # Format plot
     #plt.xticks(rotation=45, ha='right')
     #plt.subplots_adjust(bottom=0.30)
     #plt.title('TMP102 Temperature over Time')
-    plt.xlabel('Temperature (deg C)')
-    plt.ylabel('Pressure (bar)')
+    return trace,
 
 # Set up plot to call animate() function periodically
-ani = animation.FuncAnimation(fig, animate, fargs=(temp, pres), interval=1000)
+ani = animation.FuncAnimation(fig, animate, interval=1000, blit=True)
 plt.show()
\ No newline at end of file
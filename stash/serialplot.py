@@ -12,66 +12,64 @@ fig = plt.figure()
 ax1 = fig.add_subplot(3, 1, 1)
 ax2 = fig.add_subplot(3, 1, 2)
 ax3 = fig.add_subplot(3, 1, 3)
-t = []
-temp_ext = []
-temp_int = []
-temp_set = []
-Cp = []
-Ci = []
-Cd = []
-Hp = []
-Hi = []
-Hd = []
 
-# This function is called periodically from FuncAnimation
-def animate(i, t, temp_ext, temp_int, temp_set, Cp, Ci, Cd, Hp, Hi, Hd):
-    
-    data = pd.read_csv(file_data, sep='\t')
+# one persistent line per series; (axis, column, color)
+traces = [
+    (ax1, 'T_ext', "red"),
+    (ax1, 'T_int', "green"),
+    (ax1, 'T_set', "yellow"),
+    (ax2, 'Cp', "darkblue"),
+    (ax2, 'Ci', "lightblue"),
+    (ax2, 'Cd', "blue"),
+    (ax3, 'Hp', "darkred"),
+    (ax3, 'Hi', "pink"),
+    (ax3, 'Hd', "red")
+]
+lines = {col: ax.plot([], [], c=color)[0] for ax, col, color in traces}
 
-    t = data['watch']
-    temp_ext = data['T_ext']
-    temp_int = data['T_int']
-    temp_set = data['T_set']
-    Cp = data['Cp']
-    Ci = data['Ci']
-    Cd = data['Cd']
-    Hp = data['Hp']
-    Hi = data['Hi']
-    Hd = data['Hd']
+ax1.set_ylabel('Temperature (deg C)')
+ax2.set_ylabel('parameter value')
+ax3.set_ylabel('parameter value')
+ax3.set_xlabel('time (s)')
 
-    # Draw x and y lists
-    ax1.clear()
-    ax1.plot(t, temp_ext, c="red")
-    ax1.plot(t, temp_int, c="green")
-    ax1.plot(t, temp_set, c="yellow")
-    
-    plt.ylabel('Temperature (deg C)')
-    
-    # Draw x and y lists
-    ax2.clear()
-    ax2.plot(t, Cp, c="darkblue")
-    ax2.plot(t, Ci, c="lightblue")
-    ax2.plot(t, Cd, c="blue")
-    
-    plt.ylabel('parameter value')
-    
-    # Draw x and y lists
-    ax3.clear()
-    ax3.plot(t, Hp, c="darkred")
-    ax3.plot(t, Hi, c="pink")
-    ax3.plot(t, Hd, c="red")
+# keep the log open and only parse what has been appended since the last frame
+f_data = open(file_data, 'r')
+header = f_data.readline().rstrip('\n').split('\t')
+cols = ['watch'] + [col for ax, col, color in traces]
+idx = {col: header.index(col) for col in cols}
+data = {col: [] for col in cols}
+tail = ''
+
+# This function is called periodically from FuncAnimation
+def animate(i):
+    global tail
     
-    plt.ylabel('parameter value') 
+    # the last piece is a partial line (or empty); hold it for next time
+    chunk = (tail + f_data.read()).split('\n')
+    tail = chunk.pop()
+    # nothing new, so the plot is already current
+    if not chunk:
+        return
+    for row in chunk:
+        fields = row.split('\t')
+        for col in cols:
+            data[col].append(float(fields[idx[col]]))
+
+    # update the existing lines in place
+    for ax, col, color in traces:
+        lines[col].set_data(data['watch'], data[col])
+    for ax in (ax1, ax2, ax3):
+        ax.relim()
+        ax.autoscale_view()
 
     # Format plot
     #plt.xticks(rotation=45, ha='right')
     #plt.subplots_adjust(bottom=0.30)
     #plt.title('TMP102 Temperature over Time')
-    plt.xlabel('time (s)')
     
 
 # Set up plot to call animate() function periodically
-ani = animation.FuncAnimation(fig, animate, fargs=(t, temp_ext, temp_int, temp_set, Cp, Ci, Cd, Hp, Hi, Hd), interval=1000)
+ani = animation.FuncAnimation(fig, animate, interval=1000)
 plt.show()
 
 #def my_animate(ax, i, file_data, colors, x, **kwargs):
@@ -7,6 +7,7 @@ import numpy as np
 import matplotlib
 matplotlib.use('TkAgg') # do this before importing pylab
 import matplotlib.pyplot as plt
+import matplotlib.animation as animation
 from matplotlib.widgets import Slider, Button, RadioButtons, CheckButtons
 
 import serial
@@ -44,9 +45,11 @@ Ser = serial.Serial(MyPort, 19200, timeout=1)
 fig, ax = plt.subplots()
 plt.subplots_adjust(left=0.25, bottom=0.25)
 t = np.arange(0.0, 1.0, 0.001)
+# slider-independent part of the sine's argument (t is reused further down)
+phase = 2*np.pi*t
 a0 = 5
 f0 = 3
-s = a0*np.sin(2*np.pi*f0*t)
+s = a0*np.sin(f0*phase)
 l, = plt.plot(t,s, lw=2, color='red')
 plt.axis([0, 20, 0, 1000])
 
@@ -56,24 +59,36 @@ axamp  = plt.axes([0.25, 0.15, 0.65, 0.03], axisbg=axcolor)
 
 sfreq = Slider(axfreq, 'Freq', 0.1, 30.0, valinit=f0)
 samp = Slider(axamp, 'Amp', 0.1, 10.0, valinit=a0)
-yvals = np.array([])
+# ring buffer of serial samples, one per point along l
+yvals = np.full(len(t), np.nan)
+ipos = 0
+# bytes of a partial line left over from the last read
+rxbuf = bytearray()
 
 def update(val):
 	amp = samp.val
 	freq = sfreq.val
-	l.set_ydata(amp*np.sin(2*np.pi*freq*t))
+	l.set_ydata(amp*np.sin(freq*phase))
 	fig.canvas.draw_idle()
 
-def updateSerial(yvals):
+def updateSerial(i):
+	global ipos
 	if Ser:
-		Line = Ser.readline()	# read a '\n' terminated line 
-		if Line:
-			# print Line.strip()
-			current = float(Line)
-			yvals = np.append(yvals,current)
-			l.set_ydata(yvals)
-			fig.canvas.draw_idle()
+		# take everything that has arrived in one read, keeping any partial line
+		rxbuf.extend(Ser.read(Ser.in_waiting))
+		*Lines, tail = rxbuf.split(b'\n')
+		rxbuf[:] = tail
+		vals = np.array([float(Line) for Line in Lines if Line.strip()])
+		if len(vals):
+			ipos += len(vals)
+			# overwrite the oldest samples in place, wrapping as needed;
+			# only the newest len(yvals) of a long burst can survive anyway
+			vals = vals[-len(yvals):]
+			yvals[(ipos - len(vals) + np.arange(len(vals))) % len(yvals)] = vals
+			# oldest sample first
+			l.set_ydata(np.roll(yvals, -(ipos % len(yvals))))
 			# yield(float(Line))
+	return l,
 
 sfreq.on_changed(update)
 samp.on_changed(update)
@@ -103,9 +118,12 @@ check.on_clicked(checkfunc)
 resetax = plt.axes([0.8, 0.025, 0.1, 0.04])
 button = Button(resetax, 'Reset', color=axcolor, hovercolor='0.975')
 def reset(event):
+	global ipos
 	sfreq.reset()
 	samp.reset()
-	yvals=[]
+	yvals[:] = np.nan
+	ipos = 0
+	rxbuf.clear()
 button.on_clicked(reset)
 
 # Radio buttons for color
@@ -116,4 +134,6 @@ def colorfunc(label):
 	fig.canvas.draw_idle()
 radio.on_clicked(colorfunc)
 
+# poll the port; blitting redraws only the serial trace
+ani = animation.FuncAnimation(fig, updateSerial, interval=50, blit=True)
 plt.show()
\ No newline at end of file
@@ -2,27 +2,30 @@
 
 import sys
 import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import string
+from functools import lru_cache
+
+def packet_bounds(stream):
+    "Get (STX, ETX) offsets of each packet in a byte stream; STX is None if the ETX is stray"
+    stream = np.asarray(stream)
+    ends = np.flatnonzero(stream == 134)
+    stxs = np.flatnonzero(stream == 2)
+    # first STX after the previous ETX opens each packet
+    after = np.concatenate(([0], ends[:-1] + 1))
+    first = np.searchsorted(stxs, after)
+    return [(stxs[i] if i < len(stxs) and stxs[i] < end else None, end) for i, end in zip(first, ends)]
 
 def extract_packets(hex_stream):
-    reading = False
-    packet = []
-    packets = []
-    for byte in hex_stream:
-        # comparison seems to work only in decimal!?!
-        if byte == 2:
-            reading = True
-        if reading == True:
-            packet.append(hex(byte))
-        if byte == 134:
-            reading = False
-            packets.append(packet)
-            packet = []
-            
-    return packets
+    "Split a byte stream into packets running from STX (2) through ETX (134)"
+    buf = np.asarray(hex_stream, dtype=np.uint8)
+    # an ETX with no STX before it still closes an (empty) packet
+    return [[] if start is None else [hex(byte) for byte in buf[start:end+1]] for start, end in packet_bounds(buf)]
     
+# at most 256 distinct bytes, so each decode only ever happens once
+@lru_cache(maxsize=512)
 def hex2ascii(hex):
     hex_string = hex[2:] # trim "0x"
     if len(hex_string) == 1:
@@ -37,27 +40,27 @@ def hex2ascii(hex):
     return ascii_string
     
 def hex2dec(hex):
-    hex = "0x" + hex
-    return -(int(hex, 16) & 0x800000) | (int(hex, 16) & 0x7fffff)
+    "Convert 24-bit signed hex, or an array of them, to decimal"
+    # keep the low 24 bits (6 hex digits), then parse every value in one go as big-endian 32-bit words
+    words = np.char.zfill([word[-6:] for word in np.atleast_1d(hex).astype(str)], 8)
+    vals = np.frombuffer(bytes.fromhex(''.join(words)), dtype='>u4').astype(np.int32)
+    # sign-extend the whole array at once
+    vals[vals & 0x800000 != 0] -= 0x1000000
+    return vals if np.ndim(hex) else int(vals[0])
     
 def calcLRC(input):
-    lrc = ord(input[0])
-    for i in range(1,len(input)):
-        lrc ^= ord(input[i])     
-    return lrc
+    return int(np.bitwise_xor.reduce(np.frombuffer(input.encode("latin-1"), dtype=np.uint8)))
     
 def all_odd(input):
-    return [term+1 if term%2 == 0 else term for term in input]
+    return (np.asarray(input, dtype=np.int64) | 1).tolist()
     
 def all_even(input):
-    return [term if term%2 == 0 else term+1 for term in input]
+    terms = np.asarray(input, dtype=np.int64)
+    return (terms + (terms & 1)).tolist()
 
 # same as above, takes list of numbers
 def calcLRC_dec(input):
-    lrc = input[0]
-    for i in range(1,len(input)):
-        lrc ^= input[i]
-    return lrc
+    return int(np.bitwise_xor.reduce(np.asarray(input, dtype=np.int64)))
 """   
 def calcLRC_dec2(input):
     lrc = input[0]
@@ -84,6 +87,12 @@ def calcLRC_dec2(input):
 dir_captures = "/Users/jwinnikoff/Documents/MBARI/spectackler/RF5301_packets"
 # filename pattern
 suffix = ".txt"
+# a clean capture row holds exactly one of these in its ASCII column
+chars_printable = frozenset(string.printable)
+
+# parsed captures are pickled here and reused until the capture changes
+dir_cache = os.path.join(dir_captures, "cache")
+os.makedirs(dir_cache, exist_ok=True)
 
 # load files
 files_all = os.listdir(dir_captures)
@@ -93,11 +102,21 @@ tables_capture = {}
 hex_capture = []
 for file in files_suffix:
     print(file)
+    file_capture = os.path.join(dir_captures, file)
+    file_cache = os.path.join(dir_cache, file.replace(suffix, ".pkl"))
     try:
-        table = pd.read_csv(os.path.join(dir_captures, file), skiprows = 61, delim_whitespace=True).iloc[1:-1,:]
+        if os.path.exists(file_cache) and os.path.getmtime(file_cache) >= os.path.getmtime(file_capture):
+            table = pd.read_pickle(file_cache)
+        else:
+            # skip the preamble; keep every column, since the packet TSVs carry them all
+            # (Hex stays a string so its leading zeros survive)
+            table = pd.read_csv(file_capture, skiprows = 61, sep=r"\s+", engine="c", dtype={"Hex": str}).iloc[1:-1,:]
+            table.to_pickle(file_cache)
         if "7-bit_ASCII" in table.columns:
             tables_capture[file] = table
-        hex_capture.append([eval('0x'+string) for string in list(table.loc[:,"Hex"])])
+        # decode the whole Hex column in one pass, skipping non-data events (start/stop markers etc.)
+        hex_data = table.loc[~table["Bin"].astype(str).str.contains("<", regex=False), "Hex"]
+        hex_capture.append(np.frombuffer(bytes.fromhex(hex_data.str.cat()), dtype=np.uint8))
     except:
         print("PARSE ERR")
         pass
@@ -105,27 +124,10 @@ for file in files_suffix:
 tables_packets = {}
 for file, table in tables_capture.items():
     # filter the table to rows containing only one byte each (there are some glitches)
-    tables_capture[file] = table.loc[table['7-bit_ASCII'].isin(list(string.printable))]
+    tables_capture[file] = table.loc[table['7-bit_ASCII'].isin(chars_printable)]
     # now, split it into packets
-    packets = []
-    packet = []
-    reading = False
-    for i, row in tables_capture[file].iterrows():
-        byte = int(row["Dec"])
-        if byte == 2:
-            reading = True
-        if reading == True:
-            packet.append(row)
-        if byte == 134:
-            reading = False
-            try:
-                #print(pd.concat(packet))
-                packets.append(pd.concat(packet, axis=1).transpose())
-            except:
-                #print("empty packet!")
-                pass
-            packet = []
-    tables_packets[file] = packets
+    dec = tables_capture[file]["Dec"].astype(int).to_numpy()
+    tables_packets[file] = [tables_capture[file].iloc[start:end+1] for start, end in packet_bounds(dec) if start is not None]
     
 for file, stream in tables_packets.items():
     for i, packet in enumerate(stream):
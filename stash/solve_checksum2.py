@@ -21,13 +21,19 @@ suffix = ".tsv"
 files_all = os.listdir(dir_packets)
 files_suffix = [filename for filename in files_all if suffix in filename]
 
-messages = [''.join(str(i) for i in list(pd.read_csv(os.path.join(dir_packets, file), sep='\t').iloc[1:-1,:].loc[:,"Hex"])) for file in files_suffix]
+# only the Hex column is needed; read it as text so leading zeros survive
+messages = set()
+for file in files_suffix:
+	hexcol = pd.read_csv(os.path.join(dir_packets, file), sep='\t', usecols=["Hex"], dtype=str, engine="c")["Hex"]
+	messages.add(hexcol.iloc[1:-1].str.cat())
 
-print(set(messages))
+print(messages)
 
+# random.sample needs a sequence; build it once
+pool = list(messages)
 while True:
 	# pull four messages randomly and run reveng
-	samp_messages = random.sample(set(messages), 4)
+	samp_messages = random.sample(pool, 4)
 	cmd_reveng = "reveng -w 16 -q 0 -F -s " + ' '.join(samp_messages)
 	try:
 		result = subprocess.check_output(cmd_reveng, shell=True, stderr=subprocess.DEVNULL)
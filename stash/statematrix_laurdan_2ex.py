@@ -6,13 +6,14 @@ modified 20210207 to go easy on samples with low Tbh
 """
 
 import sys
-from math import ceil
+import numpy as np
 
 def floatrange(beg, end, inc):
-	return [beg+i*inc for i in range(ceil((end-beg)/inc))]
+	# an integer start and step keep integer levels, as they print
+	return np.arange(beg, end, inc, dtype=np.result_type(beg, inc)).tolist()
 	
 def printstate():
-	print('\t'.join([str(dict_state[var]) for var in list_head]))
+	rows.append([dict_state[var] for var in list_head])
 
 p_range = (0, 501, 125)
 t_range = (3, 28.1, 6.25)
@@ -28,6 +29,18 @@ print(t_levels, file=sys.stderr)
 list_head = ["P_set", "T_set", "wl_ex", "wl_em", "slit_ex", "slit_em", "n_read", "msg"]
 
 print('\t'.join(list_head))
+# rows are collected and written out in one go at the end
+rows = []
+
+# measurement settings for each row of a state, in order
+recipes = [
+	# GP410
+	{"slit_ex": 15, "slit_em": 10, "n_read": 11, "wl_ex": 410, "wl_em": 440},
+	{"slit_ex": 15, "slit_em": 10, "n_read": 11, "wl_ex": 410, "wl_em": 490},
+	# GP340
+	{"slit_ex": 20, "slit_em": 20, "n_read": 6, "wl_ex": 340, "wl_em": 440},
+	{"slit_ex": 20, "slit_em": 20, "n_read": 6, "wl_ex": 340, "wl_em": 490}
+]
 
 dict_state = {}
 dict_state["pol_ex"] = 'V'
@@ -45,23 +58,10 @@ for cyc in range(1):
     				# measure both Laurdan emissions
     				for rep in range(rep_gp):
     					dict_state["msg"] = "tdir:{tdir}_pdir:{pdir}_rep:{rep}_cyc:{cyc}".format(tdir=tdir, pdir=pdir, rep=rep, cyc=cyc)
-    					# GP410
-    					dict_state["slit_ex"] = 15
-    					dict_state["slit_em"] = 10
-    					dict_state["n_read"] = 11
-    					dict_state["wl_ex"] = 410
-    					dict_state["wl_em"] = 440
-    					printstate()
-    					dict_state["wl_em"] = 490
-    					printstate()
-    					# GP340
-    					dict_state["slit_ex"] = 20
-    					dict_state["slit_em"] = 20
-    					dict_state["n_read"] = 6
-    					dict_state["wl_ex"] = 340
-    					dict_state["wl_em"] = 440
-    					printstate()
-    					dict_state["wl_em"] = 490
-    					printstate()
+    					for recipe in recipes:
+    						dict_state.update(recipe)
+    						printstate()
     			p_levels.reverse()
-    	t_levels.reverse()
\ No newline at end of file
+    	t_levels.reverse()
+
+np.savetxt(sys.stdout, rows, fmt='%s', delimiter='\t')
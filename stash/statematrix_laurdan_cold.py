@@ -6,13 +6,14 @@ modified 20210207 to go easy on samples with low Tbh
 """
 
 import sys
-from math import ceil
+import numpy as np
 
 def floatrange(beg, end, inc):
-	return [beg+i*inc for i in range(ceil((end-beg)/inc))]
+	# an integer start and step keep integer levels, as they print
+	return np.arange(beg, end, inc, dtype=np.result_type(beg, inc)).tolist()
 	
 def printstate():
-	print('\t'.join([str(dict_state[var]) for var in list_head]))
+	rows.append([dict_state[var] for var in list_head])
 
 p_range = (0, 501, 62.5)
 t_range = (0.5, 10.5, 1)
@@ -28,6 +29,8 @@ print(t_levels, file=sys.stderr)
 list_head = ["P_set", "T_set", "wl_ex", "wl_em", "pol_ex", "pol_em", "msg"]
 
 print('\t'.join(list_head))
+# rows are collected and written out in one go at the end
+rows = []
 
 dict_state = {}
 dict_state["pol_ex"] = '0'
@@ -51,4 +54,6 @@ for cyc in range(1):
     					dict_state["wl_em"] = 490
     					printstate()
     			p_levels.reverse()
-    	t_levels.reverse()
\ No newline at end of file
+    	t_levels.reverse()
+
+np.savetxt(sys.stdout, rows, fmt='%s', delimiter='\t')
@@ -22,6 +22,20 @@ import filterswapper
 # poll serial
 devs = poll_serial()
 
+# how to open each instrument, given its port
+_CONNECT = {
+	"bath" : lambda dev: isotemp6200.IsotempController(dev, baud=9600, timeout=1),
+	"pump" : lambda dev: isco260D.ISCOController(dev, baud=9600, timeout=1, source=0, dest=1),
+	"spec" : lambda dev: rf5301PC.IsotempController(dev, baud=9600, timeout=1),
+	"swap" : lambda dev: filterswapper.FilterController(dev, baud=9600, timeout=1)
+}
+# USB-serial adapters known to be cabled to a given instrument
+_PORT_TAGS = {
+	"AL01M1X9"  : "bath",
+	"FTV5C58R1" : "pump",
+	"FTV5C58R0" : "spec"
+}
+
 def poll_serial():
 	"""
 	Find ports for the bath, pump, spec, and swapper. 
@@ -33,35 +47,23 @@ def poll_serial():
 	ports = serial.tools.list_ports.comports(include_links=True)
 	
 	devs = dict()
-	num_devs = 4
 	
 	for port in ports:
-		# try to connect bath
-		try:
-			devs["bath"] = isotemp6200.IsotempController(port[0], baud=9600, timeout=1)
-		except:
-			pass
-		# try to connect pump
-		try:
-			devs["pump"] = isco260D.ISCOController(port[0], baud=9600, timeout=1, source=0, dest=1)
-		except:
-			pass
-		# try to connect spec
-		try:
-			devs["spec"] = rf5301PC.IsotempController(port[0], baud=9600, timeout=1)
-		except:
-			pass
-		# try to connect filter swapper
-		try:
-			devs["swap"] = filterswapper.FilterController(port[0], baud=9600, timeout=1)
-		except:
-			pass
+		# a recognized adapter only gets its own driver;
+		# anything else is tried against whatever is still missing
+		tags = [name for tag, name in _PORT_TAGS.items() if port[0].endswith(tag)]
+		for name in tags or [name for name in _CONNECT if name not in devs]:
+			try:
+				devs[name] = _CONNECT[name](port[0])
+				break
+			except:
+				pass
 			
 	# report all the devices connected
 	print(devs)
 	
 	# Throw an error if any device is missing
-	if len(devs.keys() < num_devs):
+	if len(devs) < len(_CONNECT):
 		raise DeviceNotFoundError()
 		
 	return devs
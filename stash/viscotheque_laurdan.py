@@ -29,7 +29,6 @@ import numpy as np
 import pandas as pd
 from collections import deque
 import threading
-from math import isclose
 import isotemp6200
 import isco260D
 import rf5301
@@ -59,11 +58,12 @@ def temp_act2ext(temp_act):
     return (temp_act + 3.199902021) / 1.1805262
     
 def poll(dev, free, meas):
+    "Poll the passed device all at once. Free is a threading.Event, meas a deque"
+    # the device's class never changes, so dispatch on it once
+    devclass = dev.__class__.__name__
     while True:
         try:
-            "Poll the passed device all at once. Free is a threading.Event, meas a deque"
             free.wait()
-            devclass = dev.__class__.__name__
             if devclass == "IsotempController":
                 temp_ext = dev.temp_get_ext()
                 vals_dict = {
@@ -140,11 +140,9 @@ def parse_args(argv):
 def main(args, stdin, stdout, stderr):
     "Run a temperature/parameter scan and store output to a file."
     
-    # if args are passed as namespace, convert it to dict
-    try:
-        args = vars(args)
-    except:
-        pass
+    # if args are passed as a dict, convert it to a namespace
+    if isinstance(args, dict):
+        args = argparse.Namespace(**args)
     
     if not stdin.isatty():
         # if a state table is passed on stdin, read it
@@ -153,40 +151,42 @@ def main(args, stdin, stdout, stderr):
     else:
         # generate state table from args
         ranges = {
-            "T_set"     : np.arange(*args['range_T']).tolist(),
-            "P_set"     : np.arange(*args['range_P']).tolist(),
-            "wl_ex" : np.arange(*args['wl_ex']).tolist(),
-            "wl_em" : np.arange(*args['wl_em']).tolist(),
+            "T_set"     : np.arange(*args.range_T).tolist(),
+            "P_set"     : np.arange(*args.range_P).tolist(),
+            "wl_ex" : np.arange(*args.wl_ex).tolist(),
+            "wl_em" : np.arange(*args.wl_em).tolist(),
         }
        
         # calculate cartesian product of these ranges
         states = pd.DataFrame(list(product_dict(**ranges)))
         # sort for efficient transitions
         # parameters on the right change faster
-        states = states.sort_values(by=args['scan_rank'], ascending=args['scan_asc']).reset_index(drop=True)
+        states = states.sort_values(by=args.scan_rank, ascending=args.scan_asc).reset_index(drop=True)
         # print the generated table to stdout for records
         states.to_csv(stdout, sep='\t')
     
     ## run the experiment
     
     # open output file, do not overwrite!
-    with open(args['file_log'], 'x') as hand_log:
+    with open(args.file_log, 'x') as hand_log:
     
         # compose and write header
         list_head = ["clock", "watch", "state"] + list(states.head()) + ["T_int", "T_ext", "T_act", "P_act", "intensity"]
         line_head = "\t".join(list_head)
         hand_log.write(line_head + '\n')
         hand_log.flush()
+        # data rows follow the same column order
+        row_fmt = "\t".join(["{}"]*len(list_head)) + '\n'
         
         # now we're opening serial connections, which need to be closed cleanly on exit
         try:
             # init instruments
             print("connecting...", file=stderr)
-            bath = isotemp6200.IsotempController(port=args['port_bath'])
+            bath = isotemp6200.IsotempController(port=args.port_bath)
             print("temperature controller √", file=stderr)
-            pump = isco260D.ISCOController(port=args['port_pump'])
+            pump = isco260D.ISCOController(port=args.port_pump)
             print("pressure controller    √", file=stderr)
-            spec = rf5301.RF5301(port=args['port_spec'])
+            spec = rf5301.RF5301(port=args.port_spec)
             print("fluorospectrometer     √", file=stderr)
             
             ## hardware init
@@ -216,7 +216,7 @@ def main(args, stdin, stdout, stderr):
             print("√ V0 = {} mL".format(vol_start), file=stderr)
                 
             # open the shutter, unless in auto
-            if not args["auto_shut"]:
+            if not args.auto_shut:
                 while not spec.shutter(True):
                     pass
             
@@ -224,6 +224,8 @@ def main(args, stdin, stdout, stderr):
             queue_bath = deque(maxlen=1)
             queue_pump = deque(maxlen=1)
             queue_spec = deque(maxlen=1)
+            # the data loops visit every device's queue each cycle
+            queues = (queue_bath, queue_pump, queue_spec)
             
             # start polling threads
             # all device instances have RLocks!
@@ -231,64 +233,69 @@ def main(args, stdin, stdout, stderr):
             pump_free = threading.Event()
             spec_free = threading.Event()
             [event.set() for event in (bath_free, pump_free, spec_free)]
-            threading.Thread(name="pollbath", target=poll, args=(bath, bath_free, queue_bath)).start()
-            threading.Thread(name="pollpump", target=poll, args=(pump, pump_free, queue_pump)).start()
-            threading.Thread(name="pollspec", target=poll, args=(spec, spec_free, queue_spec)).start()
+            threading.Thread(name="pollbath", target=poll, args=(bath, bath_free, queue_bath), daemon=True).start()
+            threading.Thread(name="pollpump", target=poll, args=(pump, pump_free, queue_pump), daemon=True).start()
+            threading.Thread(name="pollspec", target=poll, args=(spec, spec_free, queue_spec), daemon=True).start()
             
             ## run experiment
             
             # start experiment timer (i.e. stopwatch)
             time_start = time.time()
+            # the clock column only resolves whole seconds, so format it once per second
+            sec_clock = None
+            # log rows are flushed at least this often (s), and at the end of each state
+            flush_interval = 1
+            time_flush = time_start
             
             time_air_tot = 0
             save_air = True
         
             list_data = [0]*10
             
+            # one dict per state, converted up front
+            state_rows = states.to_dict('records')
+            n_states = len(state_rows)
+            
+            # actual setpoints passed to the waterbath, for every state at once
+            temps_set = np.round(temp_ext2int(temp_act2ext(states['T_set'].to_numpy())), prec_bath).tolist()
+            # the bath-side tolerance does not depend on the state
+            temp_tol = round(args.tol_T / 1.18052628 * 1.312841332, prec_bath)
+            
+            # which states need to equilibrate coming in, and going out?
+            # (the run starts and ends from all-zero setpoints)
+            vals_eq = states[np.atleast_1d(args.vars_eq).tolist()].to_numpy()
+            pad_eq = np.zeros((1, vals_eq.shape[1]))
+            eq_prev = np.any(vals_eq != np.vstack((pad_eq, vals_eq[:-1])), axis=1)
+            eq_next = np.any(vals_eq != np.vstack((vals_eq[1:], pad_eq)), axis=1)
+            
             # iterate over test states
-            for state_num in range(states.shape[0]):
+            for state_num in range(n_states):
             
-                # make dicts for this state, the last, and the next
-                # takes about 1 ms
-                state_curr = states.iloc[state_num+0].to_dict()
-                if state_num: 
-                    state_prev = states.iloc[state_num-1].to_dict()
-                else:
-                    # if first state
-                    state_prev = {key: 0 for key in state_curr.keys()}
-                    chg_prev = {key: True for key in state_curr.keys()}
-                if state_num < states.shape[0]-1:
-                    state_next = states.iloc[state_num+1].to_dict()
-                else:
-                    # if final state
-                    state_next = {key: 0 for key in state_curr.keys()}
-                    chg_next = {key: True for key in state_curr.keys()}
-                
-                # which params have changed since previous state?
-                chg_prev = {key: (state_curr[key] != state_prev[key]) for key in state_curr.keys()}
-                chg_next = {key: (state_curr[key] != state_next[key]) for key in state_curr.keys()}
+                # dict for this state
+                # (changes to and from its neighbours are in eq_prev/eq_next)
+                state_curr = state_rows[state_num]
                 
                 time_state = time.time() # mark time
                 waited = False # did the state have to wait for stability?
                 readings = 0 # reset n counter
                 
                 # status update
-                print("state {}/{}:".format(state_num+1, states.shape[0]), file=stderr)
+                print("state {}/{}:".format(state_num+1, n_states), file=stderr)
                 print(state_curr, file=stderr)
                 
                 # set temp persistently
                 # this is the actual setpoint passed to the waterbath
-                temp_set = round(temp_ext2int(temp_act2ext(state_curr['T_set'])), prec_bath)
-                temp_tol = round(args['tol_T'] / 1.18052628 * 1.312841332, prec_bath)
+                temp_set = temps_set[state_num]
                 bath_free.clear()
-                while not isclose(bath.temp_set(), temp_set):
+                # the bath reports its setpoint to prec_bath decimal places
+                while abs(bath.temp_set() - temp_set) > 0.5 * 10**-prec_bath:
                     print("setting temperature to {}˚C".format(state_curr['T_set']), file=stderr, end=' ')
                     if bath.temp_set(temp_set): print('√', file=stderr)
                 bath_free.set()
                 
                 # set pres persistently
                 pump_free.clear()
-                while not isclose(pump.press_set(), state_curr['P_set']):
+                while abs(pump.press_set() - state_curr['P_set']) > args.tol_P:
                     print("setting pressure to {} bar".format(state_curr['P_set']), file=stderr, end=' ')
                     if pump.press_set(state_curr['P_set']): print('√', file=stderr)
                 pump_free.set()
@@ -317,37 +324,36 @@ def main(args, stdin, stdout, stderr):
                         if spec.wl_set_laurdan_red(): print('√', file=stderr)
                     spec_free.set()
                 
-                # init a log table for the state
-                trails = pd.DataFrame(columns = list_head)
+                # init a trailing buffer of data rows for the state
+                trails = deque()
                 
                 # data logging loop
                 data_dict = {}
                 # init the data dict. Persistent the first time.
-                for dq in (queue_bath, queue_pump, queue_spec):
-                    while True:
-                        # ensure that *something* gets popped out so the dict is complete
-                        try:
-                            data_dict.update(dq.popleft())
-                            break
-                        except:
-                            pass
+                for dq in queues:
+                    # ensure that *something* gets popped out so the dict is complete
+                    while not dq:
+                        time.sleep(0.01)
+                    data_dict.update(dq.popleft())
                                 
                 while True:
                 
                     time_cycle = time.time()
+                    if int(time_cycle) != sec_clock:
+                        sec_clock = int(time_cycle)
+                        clock = time.strftime("%Y%m%d %H%M%S", time.localtime(time_cycle))
                     
                     # DATA FIRST
-                    for dq in (queue_bath, queue_pump, queue_spec):
-                        try:
+                    # take the latest reading from every device that has one;
+                    # this thread is the only consumer, so a non-empty deque stays non-empty
+                    for dq in queues:
+                        if dq:
                             data_dict.update(dq.popleft())
-                            break
-                        except:
-                            pass
                     # add internal data
                     data_dict.update(
                         {
-                            "clock" : time.strftime("%Y%m%d %H%M%S"),
-                            "watch" : time.time() - time_start,
+                            "clock" : clock,
+                            "watch" : time_cycle - time_start,
                             "state" : state_num,
                             "T_set" : state_curr["T_set"],
                             "P_set" : state_curr["P_set"],
@@ -360,19 +366,19 @@ def main(args, stdin, stdout, stderr):
                     
                     # SAFETY SECOND
                     # check for pressure system leak
-                    if (data_dict["vol"] - vol_start) > args["vol_diff"]:
+                    if (data_dict["vol"] - vol_start) > args.vol_diff:
                         pump_free.clear()
                         pump.clear()
-                        raise Exception("Pump has discharged > {} mL!".format(args["vol_diff"]))
+                        raise Exception("Pump has discharged > {} mL!".format(args.vol_diff))
                         
                     # AIR SAVER
                     # if transition's been running for >2x the stability time,
                     # but bath internal temperature still not in range,
                     # shut air off temporarily
-                    if args["air_saver"] and \
-                        ((time_cycle - time_state) >= 2 * args["eq_min"]) and \
-                        (data_dict["T_int"] < temp_set - temp_tol) or \
-                        (data_dict["T_int"] > temp_set + temp_tol):
+                    T_err = data_dict["T_int"] - temp_set
+                    if args.air_saver and \
+                        ((time_cycle - time_state) >= 2 * args.eq_min) and \
+                        ((T_err < -temp_tol) or (T_err > temp_tol)):
                         if waited and not save_air: print(file=stderr)
                         if not save_air: print("air saver activated", end='', file=stderr)
                         save_air = True
@@ -381,7 +387,7 @@ def main(args, stdin, stdout, stderr):
                         
                     # control the air system
                     #NTS 20200720: pin set executes twice, which is annoying but not fatal
-                    if data_dict['T_act'] <= args["dewpoint"] and not save_air:
+                    if data_dict['T_act'] <= args.dewpoint and not save_air:
                         # if it's cold
                         if not data_dict['air']:
                             # and air is off
@@ -411,75 +417,80 @@ def main(args, stdin, stdout, stderr):
                             print("total air time {} s".format(round(time_air_tot)), file=stderr)
                     
                     # does the state change require equilibration?
-                    if any([chg_prev[var] for var in args["vars_eq"]]):
-                        # if any of the slow params have changed from last state
-                        need2wait = True
-                    else:
-                        need2wait = False
+                    # i.e. have any of the slow params changed from last state
+                    need2wait = eq_prev[state_num]
+                    
+                    # put data in the trailing buffer
+                    trails.append(data_dict.copy())
+                    # cut the buffer down to within the trailing time
+                    while trails[0]['watch'] < trails[-1]['watch'] - args.eq_min:
+                        trails.popleft()
                     
-                    # put data in the temporary trailing DF
-                    trails = trails.append(data_dict, ignore_index=True)
-                    # cut the DF down to within the trailing time
-                    trails = trails[trails['watch'] >= trails['watch'].iloc[-1] - args["eq_min"]]
+                    # has the fluor reading changed?
+                    read_new = (len(trails) == 1) or (trails[-1]["intensity"] != trails[-2]["intensity"])
                     
-                    # if the fluor reading has changed
-                    # this check takes about 0.1 ms
-                    if (trails.shape[0] == 1) or (trails["intensity"].iloc[-1] !=  trails["intensity"].iloc[-2]):
+                    # if so
+                    if read_new:
                         # write data to file
-                        hand_log.write('\t'.join([str(data_dict[col]) for col in list_head])+'\n')
-                        hand_log.flush()
+                        hand_log.write(row_fmt.format(*[data_dict[col] for col in list_head]))
+                        if time_cycle - time_flush >= flush_interval:
+                            hand_log.flush()
+                            time_flush = time_cycle
                         
                     #NTS 20200719: It would be nice to abstract pressure and temp stability!
-                    try:
+                    temp_in_range = False
+                    pres_in_range = False
+                    # the window only matters once min equilibration has elapsed,
+                    # so don't scan it before then
+                    if need2wait and (time_cycle - time_state) >= args.eq_min:
                         # note that this checks range of the internal temperature, and stability of the actual temperature
-                        temp_in_range = ((max(trails["T_int"]) <= temp_set + temp_tol) and (min(trails["T_int"]) >= temp_set - temp_tol) and ((max(trails["T_act"]) - min(trails["T_act"]) <= 2 * args["tol_T"])))
-                        pres_in_range = ((max(trails["P_act"]) <= state_curr["P_set"] + args["tol_P"]) and (min(trails["P_act"]) >= state_curr["P_set"] - args["tol_P"]))
-                    except:
-                        # in case the dataframe is Empty
-                        temp_in_range = False
-                        pres_in_range = False
-                        pass
+                        temps_int = [row["T_int"] for row in trails]
+                        temps_act = [row["T_act"] for row in trails]
+                        press_act = [row["P_act"] for row in trails]
+                        temp_in_range = ((max(temps_int) <= temp_set + temp_tol) and (min(temps_int) >= temp_set - temp_tol) and ((max(temps_act) - min(temps_act) <= 2 * args.tol_T)))
+                        pres_in_range = ((max(press_act) <= state_curr["P_set"] + args.tol_P) and (min(press_act) >= state_curr["P_set"] - args.tol_P))
                     
                     # if we're equilibrated
                     # and in range
                     # or state has timed out
                     # and windows are defogged
-                    if ((not need2wait or (time_cycle - time_state) >= args["eq_min"] and \
+                    if ((not need2wait or (time_cycle - time_state) >= args.eq_min and \
                        temp_in_range and pres_in_range and not save_air) or \
-                       (time_cycle - time_state) >= args["eq_max"]) and \
-                       (data_dict['T_act'] > args["dewpoint"] or (time_cycle - time_air) >= args["air_time"]) :
+                       (time_cycle - time_state) >= args.eq_max) and \
+                       (data_dict['T_act'] > args.dewpoint or (time_cycle - time_air) >= args.air_time) :
                        
                         if waited: print(file=stderr) # newline
                         waited = False
                         
                         # open the shutter
-                        if (not readings) and args["auto_shut"] and any([chg_prev[var] for var in args["vars_eq"]]): 
+                        if (not readings) and args.auto_shut and eq_prev[state_num]: 
                             spec_free.clear()
                             while not spec.shutter(True):
                                 pass
                             spec_free.set()
                         # take some readings
-                        if (trails.shape[0] == 1) or (trails["intensity"].iloc[-1] !=  trails["intensity"].iloc[-2]):
-                            if readings: print("reading {}: {} AU\r".format(readings, trails['intensity'].iloc[-1]), end='', file=stderr)
+                        if read_new:
+                            if readings: print("reading {}: {} AU\r".format(readings, trails[-1]['intensity']), end='', file=stderr)
                             readings += 1
                         # break out of loop to next state
-                        if (readings > args["n_read"]):
-                            if args["auto_shut"] and any([chg_next[var] for var in args["vars_eq"]]):
+                        if (readings > args.n_read):
+                            if args.auto_shut and eq_next[state_num]:
                                 spec_free.clear()
                                 while not spec.shutter(False):
                                     pass
                                 spec_free.set()
                             print(file=stderr)
+                            hand_log.flush()
                             break
                             
                     else:
                         # what are we waiting for?
-                        print("waiting {} s to get {} s of stability\r".format(round(time.time()-time_state), args["eq_min"]), end='', file=stderr)
+                        print("waiting {} s to get {} s of stability\r".format(round(time.time()-time_state), args.eq_min), end='', file=stderr)
                         waited = True
                         
                     # prescribed sleep
                     try:
-                        time.sleep((args["cycle_time"] / 1000) - (time.time() - (time_cycle)))
+                        time.sleep((args.cyc_time / 1000) - (time.time() - (time_cycle)))
                     except:
                         pass
                     
@@ -5,13 +5,14 @@ generate state matrix for a landscape of laurdan GP measurements
 """
 
 import sys
-from math import ceil
+import numpy as np
 
 def floatrange(beg, end, inc):
-	return [beg+i*inc for i in range(ceil((end-beg)/inc))]
+	# an integer start and step keep integer levels, as they print
+	return np.arange(beg, end, inc, dtype=np.result_type(beg, inc)).tolist()
 	
 def printstate():
-	print('\t'.join([str(dict_state[var]) for var in list_head]))
+	rows.append([dict_state[var] for var in list_head])
 
 p_range = (0, 501, 125)
 t_range = (3, 29, 6.25)
@@ -27,6 +28,8 @@ print(t_levels, file=sys.stderr)
 list_head = ["P_set", "T_set", "wl_ex", "wl_em", "pol_ex", "pol_em", "msg"]
 
 print('\t'.join(list_head))
+# rows are collected and written out in one go at the end
+rows = []
 
 dict_state = {}
 dict_state["pol_ex"] = '0'
@@ -49,4 +52,6 @@ for cyc in range(1):
     				dict_state["wl_em"] = 490
     				printstate()
     		p_levels.reverse()
-    	t_levels.reverse()
\ No newline at end of file
+    	t_levels.reverse()
+
+np.savetxt(sys.stdout, rows, fmt='%s', delimiter='\t')
@@ -340,21 +340,8 @@ def main(args, stdin, stdout, stderr):
                     state_curr['slit_ex'] == data_dict['slit_ex'] and 
                     state_curr['slit_em'] == data_dict['slit_em']):
                     #spec_free.clear() # seems like maybe these flags should be removed bc they slow things down?
-                    if (state_curr['wl_ex'] == 350) and (state_curr['wl_em'] == 428):
-                        print("setting wavelengths for DPH", file=stderr, flush=True, end=' ')
-                        if spec.wl_set_dph(): print('√', file=stderr, flush=True)
-                    elif (state_curr['wl_ex'] == 340) and (state_curr['wl_em'] == 440):
-                        print("setting wavelengths to 340/440", file=stderr, flush=True, end=' ')
-                        if spec.wl_set_340_440(): print('√', file=stderr, flush=True)
-                    elif (state_curr['wl_ex'] == 340) and (state_curr['wl_em'] == 490):
-                        print("setting wavelengths to 340/490", file=stderr, flush=True, end=' ')
-                        if spec.wl_set_340_490(): print('√', file=stderr, flush=True)
-                    elif (state_curr['wl_ex'] == 410) and (state_curr['wl_em'] == 440):
-                        print("setting wavelengths to 410/440", file=stderr, flush=True, end=' ')
-                        if spec.wl_set_410_440(): print('√', file=stderr, flush=True)
-                    elif (state_curr['wl_ex'] == 410) and (state_curr['wl_em'] == 490):
-                        print("setting wavelengths to 410/490", file=stderr, flush=True, end=' ')
-                        if spec.wl_set_410_490(): print('√', file=stderr, flush=True)
+                    print("setting wavelengths to {}/{}".format(state_curr['wl_ex'], state_curr['wl_em']), file=stderr, flush=True, end=' ')
+                    if spec.wl_set(state_curr['wl_ex'], state_curr['wl_em']): print('√', file=stderr, flush=True)
                     # allow the monochromators to register
                     time.sleep(3)
                         
@@ -30,7 +30,6 @@ import pandas as pd
 from collections import deque
 from simple_pid import PID
 import threading
-from math import isclose
 import isotemp6200
 import isco260D
 import rf5301
@@ -42,11 +41,12 @@ def dewpt(rh, temp):
     return (temp - ((100 - rh)/5))
     
 def poll(dev, free, meas, pid=None):
+    "Poll the passed devices all at once. Free is a threading.Event, meas a deque"
+    # the device's class never changes, so dispatch on it once
+    devclass = dev.__class__.__name__
     while True:
         try:
-            "Poll the passed devices all at once. Free is a threading.Event, meas a deque"
             free.wait()
-            devclass = dev.__class__.__name__
             if devclass == "IsotempController":
                 # get reference and actual temps with just one query
                 temp_ext = dev.temp_get_ext()
@@ -125,11 +125,9 @@ def parse_args(argv):
 def main(args, stdin, stdout, stderr):
     "Run a temperature/parameter scan and store output to a file."
     
-    # if args are passed as namespace, convert it to dict
-    try:
-        args = vars(args)
-    except:
-        pass
+    # if args are passed as a dict, convert it to a namespace
+    if isinstance(args, dict):
+        args = argparse.Namespace(**args)
     
     if not stdin.isatty():
         # if a state table is passed on stdin, read it
@@ -142,7 +140,7 @@ def main(args, stdin, stdout, stderr):
     ## run the experiment
     
     # open output file, do not overwrite!
-    with open(args['file_log'], 'x') as hand_log:
+    with open(args.file_log, 'x') as hand_log:
     
         # variables tracking the expt schedule
         vars_sched = ["clock", "watch", "state"]
@@ -159,13 +157,13 @@ def main(args, stdin, stdout, stderr):
             # init instruments
             print("connecting...", file=stderr)
             print("fluorospectrometer     √", file=stderr)
-            amcu = auxmcu.AuxMCU(port=args['port_amcu'])
+            amcu = auxmcu.AuxMCU(port=args.port_amcu)
             print("aux microcontroller    √", file=stderr)
-            bath = isotemp6200.IsotempController(port=args['port_bath'])
+            bath = isotemp6200.IsotempController(port=args.port_bath)
             print("temperature controller √", file=stderr)
-            pump = isco260D.ISCOController(port=args['port_pump'])
+            pump = isco260D.ISCOController(port=args.port_pump)
             print("pressure controller    √", file=stderr)
-            spec = rf5301.RF5301(port=args['port_spec'])
+            spec = rf5301.RF5301(port=args.port_spec)
             
             ## hardware init
             print("initializing...", file=stderr)
@@ -176,7 +174,7 @@ def main(args, stdin, stdout, stderr):
             while not spec.slit_em(0): pass
             while not spec.zero(): pass
             # open the shutter, unless in auto
-            if not args["auto_shut"]:
+            if not args.auto_shut:
                 while not spec.shutter(True): pass
                 print('.', end='', file=stderr)
             print(' √', file=stderr)
@@ -194,7 +192,7 @@ def main(args, stdin, stdout, stderr):
             # windup preventer
             pid.output_limits = (-20, 20)
             # enter topside cal coefficients
-            bath.cal_ext.reset(*args["rtd_cal"])
+            bath.cal_ext.reset(*args.rtd_cal)
             
             # set controller gains
             while not all(bath.pid('H', 0.8, 0, 0)):
@@ -234,6 +232,8 @@ def main(args, stdin, stdout, stderr):
             queue_pump = deque(maxlen=1)
             queue_spec = deque(maxlen=1)
             queue_amcu = deque(maxlen=1)
+            # the data loops visit every device's queue each cycle
+            queues = (queue_bath, queue_pump, queue_spec, queue_amcu)
             
             # start polling threads
             # all device instances have RLocks!
@@ -242,10 +242,10 @@ def main(args, stdin, stdout, stderr):
             spec_free = threading.Event()
             amcu_free = threading.Event()
             [event.set() for event in (bath_free, pump_free, spec_free, amcu_free)]
-            threading.Thread(name="pollbath", target=poll, args=(bath, bath_free, queue_bath, pid)).start()
-            threading.Thread(name="pollpump", target=poll, args=(pump, pump_free, queue_pump)).start()
-            threading.Thread(name="pollspec", target=poll, args=(spec, spec_free, queue_spec)).start()
-            threading.Thread(name="pollamcu", target=poll, args=(amcu, amcu_free, queue_amcu)).start()
+            threading.Thread(name="pollbath", target=poll, args=(bath, bath_free, queue_bath, pid), daemon=True).start()
+            threading.Thread(name="pollpump", target=poll, args=(pump, pump_free, queue_pump), daemon=True).start()
+            threading.Thread(name="pollspec", target=poll, args=(spec, spec_free, queue_spec), daemon=True).start()
+            threading.Thread(name="pollamcu", target=poll, args=(amcu, amcu_free, queue_amcu), daemon=True).start()
             
             ## run experiment
             
@@ -255,29 +255,35 @@ def main(args, stdin, stdout, stderr):
             
             # start experiment timer (i.e. stopwatch)
             time_start = time.time()
+            # the clock column only resolves whole seconds, so format it once per second
+            sec_clock = None
+            # log rows are flushed at least this often (s), and at the end of each state
+            flush_interval = 1
+            time_flush = time_start
+            
+            # one dict per state, converted up front
+            state_rows = states.to_dict('records')
+            n_states = len(state_rows)
+            
+            # which states will need to equilibrate going out?
+            # (the run ends at all-zero setpoints)
+            vals_eq = states[list(args.eqls)].to_numpy()
+            eq_next = np.any(vals_eq != np.vstack((vals_eq[1:], np.zeros((1, vals_eq.shape[1])))), axis=1)
             
             # iterate over test states
-            for state_num in range(states.shape[0]):
+            for state_num in range(n_states):
             
-                # make dicts for this state, the last, and the next
-                # takes about 1 ms
-                state_curr = states.iloc[state_num+0].to_dict()
+                # dicts for this state and the last
+                state_curr = state_rows[state_num]
                 if state_num: 
-                    state_prev = states.iloc[state_num-1].to_dict()
+                    state_prev = state_rows[state_num-1]
                 else:
                     # if first state
                     state_prev = {key: 0 for key in state_curr.keys()}
-                    chg_prev = {key: True for key in state_curr.keys()}
-                if state_num < states.shape[0]-1:
-                    state_next = states.iloc[state_num+1].to_dict()
-                else:
-                    # if final state
-                    state_next = {key: 0 for key in state_curr.keys()}
-                    chg_next = {key: True for key in state_curr.keys()}
                 
-                # which params have changed since previous state?
-                chg_prev = {key: (state_curr[key] != state_prev[key]) for key in state_curr.keys()}
-                chg_next = {key: (state_curr[key] != state_next[key]) for key in state_curr.keys()}
+                # does the state change require equilibration?
+                # (only the equilibrated params are compared)
+                vars_wait = [var for var in args.eqls if state_curr[var] != state_prev[var]]
                 
                 time_state = time.time() # mark time when state starts
                 waited = False # did the state have to wait for stability?
@@ -285,23 +291,21 @@ def main(args, stdin, stdout, stderr):
                 readings = 0 # reset n counter
                 
                 # status update
-                print("state {}/{}:".format(state_num+1, states.shape[0]), file=stderr)
+                print("state {}/{}:".format(state_num+1, n_states), file=stderr)
                 print(state_curr, file=stderr)
                 
                 # data logging loop
                 data_dict = {}
                 # init the data dict. Persistent the first time.
-                for dq in (queue_bath, queue_pump, queue_spec, queue_amcu):
-                    while True:
-                        # ensure that *something* gets popped out so the dict is complete
-                        try:
-                            data_dict.update(dq.popleft())
-                            break
-                        except:
-                            pass
+                for dq in queues:
+                    # ensure that *something* gets popped out so the dict is complete
+                    while not dq:
+                        time.sleep(0.01)
+                    data_dict.update(dq.popleft())
                 
                 # set temp via topside PID
-                while not isclose(pid.setpoint, state_curr['T_set']):
+                # (the setpoint is assigned directly, so it matches exactly once set)
+                if pid.setpoint != state_curr['T_set']:
                     print("setting temperature to {}˚C".format(state_curr['T_set']), file=stderr, end=' ')
                     # pid object is picked up by poll()
                     pid.setpoint = state_curr['T_set']
@@ -309,7 +313,7 @@ def main(args, stdin, stdout, stderr):
                 
                 # set pressure persistently
                 pump_free.clear()
-                while not isclose(pump.press_set(), state_curr['P_set']):
+                while abs(pump.press_set() - state_curr['P_set']) > args.tols['P_act']:
                     print("setting pressure to {} bar".format(state_curr['P_set']), file=stderr, end=' ')
                     if pump.press_set(state_curr['P_set']): print('√', file=stderr)
                 pump_free.set()
@@ -334,21 +338,8 @@ def main(args, stdin, stdout, stderr):
                     state_curr['slit_ex'] == data_dict['slit_ex'] and 
                     state_curr['slit_em'] == data_dict['slit_em']):
                     #spec_free.clear() # seems like maybe these flags should be removed bc they slow things down?
-                    if (state_curr['wl_ex'] == 350) and (state_curr['wl_em'] == 428):
-                        print("setting wavelengths for DPH", file=stderr, end=' ')
-                        if spec.wl_set_dph(): print('√', file=stderr)
-                    elif (state_curr['wl_ex'] == 340) and (state_curr['wl_em'] == 440):
-                        print("setting wavelengths to 340/440", file=stderr, end=' ')
-                        if spec.wl_set_340_440(): print('√', file=stderr)
-                    elif (state_curr['wl_ex'] == 340) and (state_curr['wl_em'] == 490):
-                        print("setting wavelengths to 340/490", file=stderr, end=' ')
-                        if spec.wl_set_340_490(): print('√', file=stderr)
-                    elif (state_curr['wl_ex'] == 410) and (state_curr['wl_em'] == 440):
-                        print("setting wavelengths to 410/440", file=stderr, end=' ')
-                        if spec.wl_set_410_440(): print('√', file=stderr)
-                    elif (state_curr['wl_ex'] == 410) and (state_curr['wl_em'] == 490):
-                        print("setting wavelengths to 410/490", file=stderr, end=' ')
-                        if spec.wl_set_410_490(): print('√', file=stderr)
+                    print("setting wavelengths to {}/{}".format(state_curr['wl_ex'], state_curr['wl_em']), file=stderr, end=' ')
+                    if spec.wl_set(state_curr['wl_ex'], state_curr['wl_em']): print('√', file=stderr)
                     # slits
                     if state_curr['slit_ex'] != data_dict['slit_ex']:
                         print("setting ex slit to {} nm".format(state_curr['slit_ex']), file=stderr, end=' ')
@@ -361,25 +352,27 @@ def main(args, stdin, stdout, stderr):
                 # set slits
                 
                 
-                # init a log table for the state
-                trails = pd.DataFrame(columns = list_head)
+                # init a trailing buffer of data rows for the state
+                trails = deque()
                                 
                 while True:
                 
                     time_cycle = time.time()
+                    if int(time_cycle) != sec_clock:
+                        sec_clock = int(time_cycle)
+                        clock = time.strftime("%Y%m%d %H%M%S", time.localtime(time_cycle))
                     
                     # DATA FIRST
-                    for dq in (queue_bath, queue_pump, queue_spec, queue_amcu):
-                        try:
+                    # take the latest reading from every device that has one;
+                    # this thread is the only consumer, so a non-empty deque stays non-empty
+                    for dq in queues:
+                        if dq:
                             data_dict.update(dq.popleft())
-                            break
-                        except:
-                            pass
                     # add internal data
                     data_dict.update(
                         {
-                            "clock" : time.strftime("%Y%m%d %H%M%S"),
-                            "watch" : time.time() - time_start,
+                            "clock" : clock,
+                            "watch" : time_cycle - time_start,
                             "state" : state_num,
                             "T_set" : state_curr["T_set"],
                             "P_set" : state_curr["P_set"],
@@ -390,14 +383,14 @@ def main(args, stdin, stdout, stderr):
                     
                     # SAFETY SECOND
                     # check for pressure system leak
-                    if (data_dict["vol"] - vol_start) > args["vol_diff"]:
+                    if (data_dict["vol"] - vol_start) > args.vol_diff:
                         pump_free.clear()
                         pump.clear()
-                        raise Exception("Pump has discharged > {} mL!".format(args["vol_diff"]))
+                        raise Exception("Pump has discharged > {} mL!".format(args.vol_diff))
                         
                     # control the air system
                     # if it's cold and air is off
-                    if (data_dict['T_act'] <= data_dict["dewpt"] + args["dew_tol"]) and not data_dict['air']:
+                    if (data_dict['T_act'] <= data_dict["dewpt"] + args.dew_tol) and not data_dict['air']:
                         pump_free.clear()
                         if waited: print(file=stderr)
                         print("\nturning air ON", file=stderr, end=' ')
@@ -406,7 +399,7 @@ def main(args, stdin, stdout, stderr):
                         pump_free.set()
                         data_dict['air'] = True
                     # if it's warm and the air is on
-                    elif (data_dict['T_act'] > (dewpt(data_dict['H_amb'], data_dict['T_amb']) + args["dew_tol"])) and data_dict['air']:
+                    elif (data_dict['T_act'] > (dewpt(data_dict['H_amb'], data_dict['T_amb']) + args.dew_tol)) and data_dict['air']:
                         # and air is on
                         pump_free.clear()
                         if waited: print(file=stderr)
@@ -416,37 +409,41 @@ def main(args, stdin, stdout, stderr):
                         pump_free.set()
                         data_dict['air'] = False
                     
-                    # does the state change require equilibration?
-                    vars_wait = [var for var in args["eqls"] if chg_prev[var]] 
                     # if this in an empty dict, all(in_range.values()) will be true
                     in_range = {var: False for var in vars_wait}
                     
                     # put new data into a trailing buffer
-                    trails = trails.append(data_dict, ignore_index=True)
-                    # cut the buffer down to the min equil time of the slowest variable
-                    if vars_wait:
-                        trails = trails[trails['watch'] >= (trails['watch'].iloc[-1] - max([min(args["eqls"][var]) for var in vars_wait]))]
+                    trails.append(data_dict.copy())
+                    # cut the buffer down to the min equil time of the slowest variable,
+                    # keeping the last two rows to spot a fresh fluor reading
+                    time_trail = trails[-1]['watch'] - max([min(args.eqls[var]) for var in vars_wait], default=0)
+                    while len(trails) > 2 and trails[0]['watch'] < time_trail:
+                        trails.popleft()
+                    
+                    # has the fluor reading changed?
+                    read_new = (len(trails) == 1) or (trails[-1]["intensity"] != trails[-2]["intensity"])
                     
-                    # if the fluor reading has changed, write line to logfile
-                    # this check takes about 0.1 ms
-                    if (trails.shape[0] == 1) or (trails["intensity"].iloc[-1] !=  trails["intensity"].iloc[-2]):
+                    # if so, write line to logfile
+                    if read_new:
                         # write data to file
-                        hand_log.write('\t'.join([str(data_dict.get(col)) for col in list_head if data_dict.get(col) is not None])+'\n')
-                        hand_log.flush()
+                        hand_log.write('\t'.join([str(val) for val in map(data_dict.get, list_head) if val is not None])+'\n')
+                        if time_cycle - time_flush >= flush_interval:
+                            hand_log.flush()
+                            time_flush = time_cycle
                         
                     for var in vars_wait:
                         # if variable's timeout is past
-                        if (time_cycle - time_state) >= max(args["eqls"][var]):
+                        if (time_cycle - time_state) >= max(args.eqls[var]):
                             in_range[var] = True
                         # else, if min equilibration has elapsed
-                        elif (time_cycle - time_state) >= min(args["eqls"][var]):
+                        elif (time_cycle - time_state) >= min(args.eqls[var]):
                             #print("{}: {}\r".format(var, data_dict[var]), end='')
                             # see if the trace of the variable is in range
-                            try: trace = trails[trails['watch'] >= (trails['watch'].iloc[-1] - min(args["eqls"][var]))][setp2meas[var]].tolist()
+                            try: trace = [row[setp2meas[var]] for row in trails if row['watch'] >= (trails[-1]['watch'] - min(args.eqls[var]))]
                             except: pass
                             #print(trace)
                             # and green- or redlight the variable as appropriate
-                            in_range[var] = ((max(trace) < (state_curr[var] + args["tols"][setp2meas[var]])) and (min(trace) > (state_curr[var] - args["tols"][setp2meas[var]])))
+                            in_range[var] = ((max(trace) < (state_curr[var] + args.tols[setp2meas[var]])) and (min(trace) > (state_curr[var] - args.tols[setp2meas[var]])))
                     
                     # if all equilibrations have cleared
                     if all(in_range.values()):
@@ -455,7 +452,7 @@ def main(args, stdin, stdout, stderr):
                         waited = False
                         
                         # open the shutter
-                        if (not readings) and args["auto_shut"] and len(vars_wait) and not sat: 
+                        if (not readings) and args.auto_shut and len(vars_wait) and not sat: 
                             spec_free.clear()
                             while not spec.shutter(True):
                                 pass
@@ -463,32 +460,33 @@ def main(args, stdin, stdout, stderr):
                             time_open = time.time()
                             
                         # let the dye relax after a long dark period (temp xsition)
-                        if ("T_set" not in vars_wait) or ((time.time() - args["shut_sit"]) >= time_open):
+                        if ("T_set" not in vars_wait) or ((time.time() - args.shut_sit) >= time_open):
                             # take some readings
-                            if (trails.shape[0] == 1) or (trails["intensity"].iloc[-1] !=  trails["intensity"].iloc[-2]):
-                                if readings: print("reading {}: {} AU \r".format(readings, trails['intensity'].iloc[-1]), end='', file=stderr)
+                            if read_new:
+                                if readings: print("reading {}: {} AU \r".format(readings, trails[-1]['intensity']), end='', file=stderr)
                                 readings += 1
                             # break out of loop to next state
                             if (readings > state_curr["n_read"]):
-                                if args["auto_shut"] and any([chg_next[var] for var in args["eqls"].keys()]):
+                                if args.auto_shut and eq_next[state_num]:
                                     spec_free.clear()
                                     while not spec.shutter(False): pass
                                     while not spec.slit_em(0): pass
                                     spec_free.set()
                                 print(file=stderr)
+                                hand_log.flush()
                                 break
                         else:
-                            print("dye relaxed for {}/{} s\r".format(round(time.time()-time_open), args["shut_sit"]), end='', file=stderr)
+                            print("dye relaxed for {}/{} s\r".format(round(time.time()-time_open), args.shut_sit), end='', file=stderr)
                             sat = True
                             # gotta get a newline in here somewhere!
                     else:
                         # what are we waiting for?
-                        print("waiting {} s to get {} s of stability\r".format(round(time.time()-time_state), max([min(args["eqls"][var]) for var in vars_wait])), end='', file=stderr)
+                        print("waiting {} s to get {} s of stability\r".format(round(time.time()-time_state), max([min(args.eqls[var]) for var in vars_wait])), end='', file=stderr)
                         waited = True
                         
                     # prescribed sleep
                     try:
-                        time.sleep((args["cycle_time"] / 1000) - (time.time() - (time_cycle)))
+                        time.sleep((args.cyc_time / 1000) - (time.time() - (time_cycle)))
                     except:
                         pass
                     